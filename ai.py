@@ -0,0 +1,167 @@
+import numpy as np
+from constants import GRID_WIDTH, GRID_HEIGHT, EMPTY
+from pieces import Piece
+from movegen import MoveGenerator
+
+# Feature weights for the board evaluation (higher score is better)
+DEFAULT_WEIGHTS = {
+    'height': -0.510066,
+    'lines': 0.760666,
+    'holes': -0.35663,
+    'bumpiness': -0.184483
+}
+
+ROW_INDEX = np.arange(GRID_HEIGHT)[:, None]
+COLUMN_INDEX = np.arange(GRID_WIDTH)
+
+
+def occupancy(board):
+    # A BitBoard's row masks, so reading its colour plane isn't needed
+    rows = getattr(board, 'rows', None)
+    if rows is not None:
+        return (np.asarray(rows, dtype=np.int64)[:, None] >> COLUMN_INDEX & 1).astype(bool)
+    return np.asarray(board.grid) != EMPTY
+
+
+def reachable_placements(board, piece=None):
+    # (rotation, x) pairs reachable from the spawn position by rotating in
+    # place and then sliding sideways, as a player would before hard drop
+    piece = piece or board.current_piece
+    rotations = len(piece.shape)
+    probe = Piece(piece.shape_name)
+    probe.y = piece.y
+    placements = []
+    for turns in range(rotations):
+        probe.rotation = (piece.rotation + turns) % rotations
+        probe.x = piece.x
+        if board.check_collision(probe):
+            break  # Later rotations have to pass through this one
+        placements.append((probe.rotation, piece.x))
+        for step in (-1, 1):
+            probe.x = piece.x + step
+            while not board.check_collision(probe):
+                placements.append((probe.rotation, probe.x))
+                probe.x += step
+    return placements
+
+
+def drop_boards(filled, piece, placements):
+    # Hard-drop the piece at every placement at once. Returns the landing
+    # row offset per placement and a (P, H, W) stack of resulting boards.
+    rows = np.where(filled, ROW_INDEX, GRID_HEIGHT)
+    next_filled = np.vstack([np.minimum.accumulate(rows[::-1], axis=0)[::-1],
+                             np.full((1, GRID_WIDTH), GRID_HEIGHT)])
+
+    cells = np.array([piece.geometry[rotation].cells for rotation, _ in placements])
+    xs = cells[:, :, 0] + np.array([x for _, x in placements])[:, None]
+    ys = cells[:, :, 1] + piece.y
+    drops = (next_filled[np.clip(ys + 1, 0, GRID_HEIGHT), xs] - ys - 1).min(axis=1)
+    ys = ys + drops[:, None]
+
+    boards = np.repeat(filled[None], len(placements), axis=0)
+    boards[np.arange(len(placements))[:, None], ys, xs] = True
+    return ys, boards
+
+
+def lock_boards(filled, piece, placements):
+    # Boards with the piece locked at (rotation, x, y) final states, such as
+    # the movegen placements that hard-dropping from spawn cannot reach
+    cells = np.array([piece.geometry[p.rotation].cells for p in placements])
+    xs = cells[:, :, 0] + np.array([p.x for p in placements])[:, None]
+    ys = cells[:, :, 1] + np.array([p.y for p in placements])[:, None]
+    boards = np.repeat(filled[None], len(placements), axis=0)
+    index = np.arange(len(placements))[:, None].repeat(cells.shape[1], axis=1)
+    visible = ys >= 0
+    boards[index[visible], ys[visible], xs[visible]] = True
+    return boards
+
+
+def clear_full_rows(boards):
+    # Drop the full rows of every board in the stack and pad with empty rows
+    # on top. Returns the cleared boards and the lines cleared per board.
+    full = boards.all(axis=2)
+    lines = full.sum(axis=1)
+    if not lines.any():
+        return boards, lines
+    order = np.argsort(~full, axis=1, kind='stable')
+    boards = np.take_along_axis(boards, order[:, :, None], axis=1)
+    boards[ROW_INDEX.T < lines[:, None]] = False
+    return boards, lines
+
+
+def board_features(boards):
+    # Features of a (P, H, W) stack of boards, measured after line clears
+    boards, lines = clear_full_rows(boards)
+    occupied = boards.any(axis=1)
+    heights = np.where(occupied, GRID_HEIGHT - boards.argmax(axis=1), 0)
+    covered = np.maximum.accumulate(boards, axis=1)
+    holes = (covered & ~boards).sum(axis=(1, 2))
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+    # Well depth: how far a column sits below its lower neighbour (the
+    # walls count as full height)
+    walls = np.full((len(heights), 1), GRID_HEIGHT)
+    padded = np.hstack([walls, heights, walls])
+    wells = np.maximum(np.minimum(padded[:, :-2], padded[:, 2:]) - heights, 0).sum(axis=1)
+    return {
+        'height': heights.sum(axis=1),
+        'lines': lines,
+        'holes': holes,
+        'bumpiness': bumpiness,
+        'wells': wells
+    }
+
+
+def evaluate(boards, weights=DEFAULT_WEIGHTS):
+    features = board_features(boards)
+    scores = np.zeros(len(boards))
+    for name, weight in weights.items():
+        scores += weight * features[name]
+    return scores
+
+
+def piece_state(piece):
+    return (piece.shape_name, piece.rotation, piece.x, piece.y)
+
+
+class PlacementAI:
+    def __init__(self, weights=DEFAULT_WEIGHTS, table=None, generator=None):
+        self.weights = weights
+        self.table = table  # Optional zobrist.TranspositionTable
+        # movegen.MoveGenerator for choose_path, e.g. one with SHIFT_KICKS
+        self.generator = generator if generator is not None else MoveGenerator()
+
+    def score_placements(self, board, piece=None):
+        piece = piece or board.current_piece
+        placements = reachable_placements(board, piece)
+        if not placements:
+            return [], np.zeros(0)
+        _, boards = drop_boards(occupancy(board), piece, placements)
+        return placements, evaluate(boards, self.weights)
+
+    def choose(self, board):
+        piece = board.current_piece
+        if self.table is not None:
+            key = self.table.key(board.hash, piece_state(piece))
+            entry = self.table.get(key)
+            if entry is not None:
+                return entry[1]
+
+        placements, scores = self.score_placements(board)
+        if not placements:
+            return piece.rotation, piece.x
+        best = int(scores.argmax())
+        if self.table is not None:
+            self.table.put(key, float(scores[best]), placements[best])
+        return placements[best]
+
+    def choose_path(self, board):
+        # Best of every placement the move generator finds (tucks and spins
+        # included); returns a movegen.Placement, or None if nothing fits
+        placements = self.generator.placements(board)
+        if not placements:
+            return None
+        boards = lock_boards(occupancy(board), board.current_piece, placements)
+        return placements[int(evaluate(boards, self.weights).argmax())]
+
+    def __call__(self, board, rng=None):
+        return self.choose(board)
\ No newline at end of file
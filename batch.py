@@ -0,0 +1,175 @@
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from constants import GRID_WIDTH
+from board import Board
+
+# A policy is a picklable callable policy(board, rng) -> (rotation, x)
+# choosing where board.current_piece should be hard-dropped.
+
+# Games stop after this many pieces unless told otherwise: on the I/O/T
+# board the AI policy practically never tops out
+MAX_PIECES = 1000
+
+# Mixed into the game seed for the policy's RNG, so a random policy's
+# choices don't replay the same stream as the board's pieces
+POLICY_SEED_SALT = 0x5EED_B0A7
+
+
+def placement_range(piece, rotation):
+    min_dx, _, max_dx, _ = piece.geometry[rotation].bbox
+    return range(-min_dx, GRID_WIDTH - max_dx)
+
+
+def random_policy(board, rng):
+    piece = board.current_piece
+    rotation = rng.randrange(len(piece.shape))
+    return rotation, rng.choice(placement_range(piece, rotation))
+
+
+class ScriptedPolicy:
+    # Cycles through a fixed list of (rotation, x) placements
+    def __init__(self, placements):
+        self.placements = placements
+        self.index = 0
+
+    def reset(self):
+        self.index = 0
+
+    def __call__(self, board, rng):
+        placement = self.placements[self.index % len(self.placements)]
+        self.index += 1
+        return placement
+
+
+def ai_policy(board, rng):
+    # Imported on first use so the other policies don't need NumPy
+    from ai import PlacementAI
+    global _ai
+    if _ai is None:
+        _ai = PlacementAI()
+    return _ai.choose(board)
+
+
+_ai = None
+
+POLICIES = {
+    'random': random_policy,
+    'ai': ai_policy,
+}
+
+
+def place(board, rotation, x):
+    # Reach the placement through the normal move rules, then hard drop
+    piece = board.current_piece
+    for _ in range((rotation - piece.rotation) % len(piece.shape)):
+        board.rotate_current_piece()
+    step = 1 if x > piece.x else -1
+    while piece.x != x and board.move_current_piece(step, 0):
+        pass
+    board.hard_drop()
+
+
+def play_game(seed, policy, board_class=Board, max_pieces=MAX_PIECES):
+    if isinstance(policy, str):
+        policy = POLICIES[policy]
+    if hasattr(policy, 'reset'):
+        policy.reset()
+    start = time.perf_counter()
+    board = board_class(seed)
+    rng = random.Random(seed ^ POLICY_SEED_SALT)
+    board.spawn_piece()
+    pieces = 0
+    while not board.game_over and (max_pieces is None or pieces < max_pieces):
+        rotation, x = policy(board, rng)
+        place(board, rotation, x)
+        pieces += 1
+    return {
+        'seed': seed,
+        'score': board.score,
+        'lines': board.lines_cleared,
+        'pieces': pieces,
+        'duration': time.perf_counter() - start
+    }
+
+
+def play_chunk(seeds, policy, board_class, max_pieces):
+    return [play_game(seed, policy, board_class, max_pieces) for seed in seeds]
+
+
+def run_batch(games, policy='random', workers=None, base_seed=0,
+              board_class=Board, max_pieces=MAX_PIECES, chunk_size=50):
+    # Yields one result dict per game, in completion order. Games are sent
+    # to the workers in chunks so millions of games don't mean millions of
+    # futures.
+    seeds = range(base_seed, base_seed + games)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_chunk, seeds[i:i + chunk_size], policy,
+                                   board_class, max_pieces)
+                   for i in range(0, games, chunk_size)]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+class BatchStats:
+    # Running aggregate of game results, bucketed into histograms
+    def __init__(self, score_bin=100, lines_bin=1, pieces_bin=10):
+        self.bins = {'score': score_bin, 'lines': lines_bin, 'pieces': pieces_bin}
+        self.histograms = {key: Counter() for key in self.bins}
+        self.totals = Counter()
+        self.games = 0
+
+    def add(self, result):
+        self.games += 1
+        for key, width in self.bins.items():
+            self.histograms[key][result[key] // width * width] += 1
+            self.totals[key] += result[key]
+        self.totals['duration'] += result['duration']
+
+    def mean(self, key):
+        return self.totals[key] / self.games if self.games else 0.0
+
+    def report(self):
+        lines = [f"games: {self.games}"]
+        for key in ('score', 'lines', 'pieces', 'duration'):
+            lines.append(f"mean {key}: {self.mean(key):.3f}")
+        for key, histogram in self.histograms.items():
+            lines.append(f"{key} histogram (bin {self.bins[key]}):")
+            for bucket in sorted(histogram):
+                lines.append(f"  {bucket:>8}: {histogram[bucket]}")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless Tetris games in parallel")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-pieces', type=int, default=MAX_PIECES,
+                        help="pieces per game before it is stopped (0 = play to top-out)")
+    parser.add_argument('--bitboard', action='store_true', help="use the BitBoard backend")
+    args = parser.parse_args()
+
+    board_class = Board
+    if args.bitboard:
+        from bitboard import BitBoard
+        board_class = BitBoard
+
+    max_pieces = args.max_pieces or None
+
+    stats = BatchStats()
+    start = time.perf_counter()
+    for result in run_batch(args.games, args.policy, args.workers, args.seed,
+                            board_class, max_pieces):
+        stats.add(result)
+    elapsed = time.perf_counter() - start
+    print(stats.report())
+    print(f"{stats.games} games in {elapsed:.2f}s ({stats.games / elapsed:.0f} games/s)")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,631 @@
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+
+# The engines import pygame, and some open their window on construction
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# Micro-benchmarks (collision check, rotation, line clear) and a macro
+# benchmark (whole games under a seeded random policy) for the Tetris engines
+# in this repo. Each engine is driven through its own rules by a small
+# adapter, the way its game loop would call them.
+
+BENCHES = ('collision', 'rotate', 'line_clear', 'game')
+UNITS = {'collision': 'check', 'rotate': 'rotation', 'line_clear': 'clear', 'game': 'piece'}
+
+# Board fixtures, bottom row last. Collision checks run against a ragged
+# stack; line clears get four full rows underneath it.
+STACK = [
+    '#.##.#..#.',
+    '##.####.##',
+    '###.######',
+    '#####.####',
+]
+FULL_ROWS = ['##########'] * 4
+
+
+def stack_cells(rows, height):
+    top = height - len(rows)
+    return [(x, top + y) for y, row in enumerate(rows) for x, c in enumerate(row) if c == '#']
+
+
+class Engine(ABC):
+    module = None
+    height = 20
+
+    def __init__(self):
+        self.mod = importlib.import_module(self.module)
+
+    def start(self, seed):
+        # Most engines draw pieces from the global random module
+        random.seed(seed)
+        return self.new_game(seed)
+
+    @abstractmethod
+    def new_game(self, seed):
+        pass
+
+    @abstractmethod
+    def collides(self, game):
+        pass
+
+    @abstractmethod
+    def rotate(self, game):
+        pass
+
+    @abstractmethod
+    def move(self, game, dx):
+        pass
+
+    @abstractmethod
+    def hard_drop(self, game):
+        pass
+
+    @abstractmethod
+    def fill(self, game, cells):
+        pass
+
+    @abstractmethod
+    def clear_lines(self, game):
+        pass
+
+    def game_over(self, game):
+        return game.game_over
+
+
+class BoardEngine(Engine):
+    module = 'board'
+    board_class = 'Board'
+
+    def new_game(self, seed):
+        board = getattr(self.mod, self.board_class)(seed)
+        board.spawn_piece()
+        return board
+
+    def collides(self, board):
+        return board.check_collision(board.current_piece)
+
+    def rotate(self, board):
+        board.rotate_current_piece()
+
+    def move(self, board, dx):
+        return board.move_current_piece(dx, 0)
+
+    def hard_drop(self, board):
+        board.hard_drop()
+
+    def fill(self, board, cells):
+        board.place_cells(cells, 1)
+
+    def clear_lines(self, board):
+        board.clear_lines()
+
+
+class BitBoardEngine(BoardEngine):
+    module = 'bitboard'
+    board_class = 'BitBoard'
+
+
+class O1CPlanEngine(Engine):
+    module = 'tetris_o1_cplan'
+
+    def new_game(self, seed):
+        board = self.mod.Board()
+        board.spawn_piece()
+        return board
+
+    def collides(self, board):
+        return not board.is_valid_position(board.current_piece)
+
+    def rotate(self, board):
+        board.rotate_piece(1)
+
+    def move(self, board, dx):
+        return board.move(dx, 0)
+
+    def hard_drop(self, board):
+        board.hard_drop()
+
+    def fill(self, board, cells):
+        for x, y in cells:
+            board.grid[y][x] = board.current_piece.color
+        board.column_tops = None
+
+    def clear_lines(self, board):
+        board.clear_lines()
+
+
+class O1ProPlanEngine(Engine):
+    # Moves live on TetrisGame, so one instance is kept and handed a fresh
+    # GameState per game
+    module = 'tetris_c_o1-pro_plan'
+
+    def __init__(self):
+        super().__init__()
+        self.app = self.mod.TetrisGame()
+
+    def new_game(self, seed):
+        self.app.game_state = self.mod.GameState()
+        return self.app
+
+    def collides(self, app):
+        state = app.game_state
+        return not state.is_valid_move(state.current_piece)
+
+    def rotate(self, app):
+        app._try_rotate()
+
+    def move(self, app, dx):
+        piece = app.game_state.current_piece
+        app._try_move(dx, 0)
+        return app.game_state.current_piece is not piece
+
+    def hard_drop(self, app):
+        app._hard_drop()
+
+    def fill(self, app, cells):
+        for x, y in cells:
+            app.game_state.board[y][x] = 'I'
+
+    def clear_lines(self, app):
+        app.game_state.clear_lines()
+
+    def game_over(self, app):
+        return app.game_state.game_over
+
+
+class DrEngine(Engine):
+    module = 'tetris_dr'
+
+    def new_game(self, seed):
+        return self.mod.TetrisGame()
+
+    def collides(self, game):
+        return not game.valid_move(game.current_piece)
+
+    def rotate(self, game):
+        if game.valid_move(game.current_piece, dr=1):
+            game.current_piece.rotate()
+
+    def move(self, game, dx):
+        if game.valid_move(game.current_piece, dx=dx):
+            game.current_piece.x += dx
+            return True
+        return False
+
+    def hard_drop(self, game):
+        while game.valid_move(game.current_piece, dy=1):
+            game.current_piece.y += 1
+        game.lock_piece(game.current_piece)
+        if not game.game_over:
+            game.current_piece = game.new_piece()
+
+    def fill(self, game, cells):
+        for x, y in cells:
+            game.grid[y][x] = game.current_piece.color
+
+    def clear_lines(self, game):
+        # Line clears only happen inside lock_piece; lock a piece lying
+        # entirely above the board so only the clear does any work
+        game.lock_piece(self.mod.Tetromino(0, -5, 0))
+
+
+class G2Engine(Engine):
+    # Tetris() opens the window, so one instance is reset between games the
+    # way its restart key does
+    module = 'tetris_g2'
+
+    def __init__(self):
+        super().__init__()
+        self.app = self.mod.Tetris()
+
+    def new_game(self, seed):
+        app = self.app
+        app.grid = [[0] * self.mod.WIDTH for _ in range(self.mod.HEIGHT)]
+        app.game_over = False
+        app.current_piece = app.new_piece()
+        app.next_piece = app.new_piece()
+        app.score = 0
+        app.level = 1
+        app.lines_cleared = 0
+        app.delay = self.mod.DELAY_INITIAL
+        return app
+
+    def collides(self, app):
+        return app.check_collision(app.current_piece)
+
+    def rotate(self, app):
+        rotated_shape = app.current_piece.get_rotated_shape()
+        app.current_piece.rotate()
+        if app.check_collision(app.current_piece, rotated_shape=rotated_shape):
+            for _ in range(3):
+                app.current_piece.rotate()
+
+    def move(self, app, dx):
+        if app.check_collision(app.current_piece, dx=dx):
+            return False
+        app.current_piece.x += dx
+        return True
+
+    def hard_drop(self, app):
+        while not app.check_collision(app.current_piece, dy=1):
+            app.current_piece.y += 1
+        app.merge_piece(app.current_piece)
+        # The game holds the next piece back for a frame after a clear; the
+        # benchmark spawns it straight away
+        if not app.clear_lines():
+            app.game_over_check()
+        if not app.game_over:
+            app.current_piece = app.next_piece
+            app.next_piece = app.new_piece()
+            if app.check_collision(app.current_piece):
+                app.game_over = True
+
+    def fill(self, app, cells):
+        for x, y in cells:
+            app.grid[y][x] = app.current_piece.color
+
+    def clear_lines(self, app):
+        app.clear_lines()
+
+
+class LockedGridEngine(Engine):
+    # tetris_o3_high and tetris_h keep locked cells in a dict next to a grid
+    # that is updated in place as pieces lock and rows clear
+    def new_game(self, seed):
+        game = SimpleNamespace(locked={}, current_piece=self.mod.get_shape(),
+                               next_piece=self.mod.get_shape(), game_over=False)
+        game.grid = self.mod.create_grid(game.locked)
+        return game
+
+    def collides(self, game):
+        return not self.mod.valid_space(game.current_piece, game.grid)
+
+    def rotate(self, game):
+        piece = game.current_piece
+        piece.rotation = (piece.rotation + 1) % len(piece.shape)
+        if not self.mod.valid_space(piece, game.grid):
+            piece.rotation = (piece.rotation - 1) % len(piece.shape)
+
+    def move(self, game, dx):
+        game.current_piece.x += dx
+        if not self.mod.valid_space(game.current_piece, game.grid):
+            game.current_piece.x -= dx
+            return False
+        return True
+
+    def hard_drop(self, game):
+        piece = game.current_piece
+        while self.mod.valid_space(piece, game.grid):
+            piece.y += 1
+        piece.y -= 1
+        shape_pos = self.mod.convert_shape_format(piece)
+        self.mod.lock_piece(game.grid, game.locked, shape_pos, piece.color)
+        game.current_piece = game.next_piece
+        game.next_piece = self.mod.get_shape()
+        self.mod.clear_rows(game.grid, game.locked)
+        game.game_over = self.mod.check_lost(game.locked)
+
+    def fill(self, game, cells):
+        for pos in cells:
+            game.locked[pos] = game.current_piece.color
+        game.grid = self.mod.create_grid(game.locked)
+
+    def clear_lines(self, game):
+        self.mod.clear_rows(game.grid, game.locked)
+
+
+class O3HighEngine(LockedGridEngine):
+    module = 'tetris_o3_high'
+
+
+class HEngine(LockedGridEngine):
+    module = 'tetris_h'
+
+    def rotate(self, game):
+        # tetris_h turns the piece once more when the rotation is blocked
+        game.current_piece.rotate()
+        if not self.mod.valid_space(game.current_piece, game.grid):
+            game.current_piece.rotate()
+
+
+class CCPlanEngine(Engine):
+    # Moves live on Game, which opens the window; one instance is reset
+    # between games
+    module = 'tetris_c_c_plan'
+
+    def __init__(self):
+        super().__init__()
+        self.app = self.mod.Game()
+
+    def new_game(self, seed):
+        app = self.app
+        app.board = self.mod.Board()
+        app.current_piece = app._new_piece()
+        app.next_piece = app._new_piece()
+        app.game_over = False
+        return app
+
+    def collides(self, app):
+        return not app.board.is_valid_move(app.current_piece)
+
+    def rotate(self, app):
+        app._rotate()
+
+    def move(self, app, dx):
+        x = app.current_piece.x
+        app._move(dx, 0)
+        return app.current_piece.x != x
+
+    def hard_drop(self, app):
+        app._hard_drop()
+
+    def fill(self, app, cells):
+        for x, y in cells:
+            app.board.grid[y][x] = 'I'
+
+    def clear_lines(self, app):
+        app.board.clear_lines()
+
+
+class R1ApiEngine(Engine):
+    module = 'tetris_r1_api'
+
+    def __init__(self):
+        super().__init__()
+        self.height = self.mod.ROWS + self.mod.BUFFER_ROWS
+
+    def new_game(self, seed):
+        board = self.mod.Board()
+        board.new_piece()
+        return board
+
+    def collides(self, board):
+        return not board.valid_move(board.current_piece)
+
+    def rotate(self, board):
+        rotated = self.mod.Tetromino(board.current_piece.shape, board.current_piece.color)
+        rotated.rotate()
+        if board.valid_move(rotated):
+            board.current_piece.rotate()
+
+    def move(self, board, dx):
+        if board.valid_move(board.current_piece, dx=dx):
+            board.current_piece.x += dx
+            return True
+        return False
+
+    def hard_drop(self, board):
+        while board.valid_move(board.current_piece, dy=1):
+            board.current_piece.y += 1
+        board.lock_piece()
+
+    def fill(self, board, cells):
+        for x, y in cells:
+            board.grid[y][x] = board.current_piece.color
+
+    def clear_lines(self, board):
+        board.clear_lines()
+
+    def game_over(self, board):
+        return any(board.grid[self.mod.BUFFER_ROWS])
+
+
+ENGINES = {
+    'board': BoardEngine,
+    'bitboard': BitBoardEngine,
+    'tetris_o1_cplan': O1CPlanEngine,
+    'tetris_c_o1-pro_plan': O1ProPlanEngine,
+    'tetris_dr': DrEngine,
+    'tetris_g2': G2Engine,
+    'tetris_o3_high': O3HighEngine,
+    'tetris_h': HEngine,
+    'tetris_c_c_plan': CCPlanEngine,
+    'tetris_r1_api': R1ApiEngine,
+}
+
+
+def play(engine, seed, max_pieces):
+    # One game under a seeded random policy: turn, slide, hard drop.
+    # Returns the number of pieces placed.
+    game = engine.start(seed)
+    rng = random.Random(seed)
+    pieces = 0
+    while not engine.game_over(game) and pieces < max_pieces:
+        for _ in range(rng.randrange(4)):
+            engine.rotate(game)
+        dx = rng.randint(-5, 5)
+        step = 1 if dx > 0 else -1
+        for _ in range(abs(dx)):
+            if not engine.move(game, step):
+                break
+        engine.hard_drop(game)
+        pieces += 1
+    return pieces
+
+
+def micro_case(engine, bench, seed):
+    # (op, state, reset): op(state) is the measured call; reset, if given,
+    # builds a fresh state before every call, outside the measurement
+    if bench == 'collision':
+        game = engine.start(seed)
+        engine.fill(game, stack_cells(STACK, engine.height))
+        return engine.collides, game, None
+    if bench == 'rotate':
+        return engine.rotate, engine.start(seed), None
+    if bench == 'line_clear':
+        cells = stack_cells(STACK + FULL_ROWS, engine.height)
+
+        def reset(_):
+            game = engine.start(seed)
+            engine.fill(game, cells)
+            return game
+        return engine.clear_lines, None, reset
+    raise ValueError(f"unknown benchmark: {bench}")
+
+
+def time_ops(op, state, reset, number):
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if reset is None:
+            start = time.perf_counter()
+            for _ in range(number):
+                op(state)
+            return time.perf_counter() - start
+        total = 0.0
+        for _ in range(number):
+            state = reset(state)
+            start = time.perf_counter()
+            op(state)
+            total += time.perf_counter() - start
+        return total
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def trace_ops(op, state, reset, number):
+    # Mean per call of the traced-memory high-water mark above the starting
+    # point (transient allocations) and of the memory still held afterwards
+    tracemalloc.start()
+    peak = retained = 0
+    try:
+        for _ in range(number):
+            if reset is not None:
+                state = reset(state)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            op(state)
+            current, high = tracemalloc.get_traced_memory()
+            peak += high - before
+            retained += current - before
+    finally:
+        tracemalloc.stop()
+    return peak / number, retained / number
+
+
+def result(bench, ops, seconds, peak, retained):
+    return {
+        'unit': UNITS[bench],
+        'ops': ops,
+        'seconds': seconds,
+        'ops_per_sec': ops / seconds if seconds else 0.0,
+        'peak_bytes_per_op': peak,
+        'retained_bytes_per_op': retained
+    }
+
+
+def run_micro(engine, bench, seed, number, repeat, alloc_number):
+    op, state, reset = micro_case(engine, bench, seed)
+    op(state if reset is None else reset(state))  # Warm up
+    seconds = min(time_ops(op, state, reset, number) for _ in range(repeat))
+    peak, retained = trace_ops(op, state, reset, alloc_number)
+    return result(bench, number, seconds, peak, retained)
+
+
+def run_game(engine, seed, games, repeat, max_pieces):
+    seeds = range(seed, seed + games)
+    play(engine, seed, max_pieces)  # Warm up
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pieces = sum(play(engine, s, max_pieces) for s in seeds)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        traced = play(engine, seed, max_pieces)
+        current, high = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    traced = max(traced, 1)
+    entry = result('game', pieces, best, (high - before) / traced, (current - before) / traced)
+    entry['games'] = games
+    return entry
+
+
+def run_suite(engines, benches, seed=0, number=2000, repeat=3, alloc_number=200,
+              games=5, max_pieces=500):
+    results = {}
+    for name in engines:
+        engine = ENGINES[name]()
+        results[name] = {}
+        for bench in benches:
+            if bench == 'game':
+                results[name][bench] = run_game(engine, seed, games, repeat, max_pieces)
+            else:
+                results[name][bench] = run_micro(engine, bench, seed, number, repeat, alloc_number)
+    return results
+
+
+def report(results, baseline=None, reference=None):
+    # `reference` names an engine in the same run to show speedups against
+    lines = [f"{'engine':<22}{'benchmark':<12}{'ops/s':>14}{'peak B/op':>12}{'kept B/op':>12}"]
+    for name, benches in results.items():
+        for bench, entry in benches.items():
+            line = (f"{name:<22}{bench:<12}{entry['ops_per_sec']:>14,.0f}"
+                    f"{entry['peak_bytes_per_op']:>12,.0f}{entry['retained_bytes_per_op']:>12,.0f}")
+            same = results.get(reference, {}).get(bench)
+            if same and same['ops_per_sec'] and name != reference:
+                line += f"  {entry['ops_per_sec'] / same['ops_per_sec']:.2f}x {reference}"
+            old = (baseline or {}).get(name, {}).get(bench)
+            if old and old['ops_per_sec']:
+                change = entry['ops_per_sec'] / old['ops_per_sec'] - 1
+                line += f"  {change:+.1%} vs baseline"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Tetris engines headlessly")
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument('--benches', nargs='+', choices=BENCHES, default=list(BENCHES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--number', type=int, default=2000, help="calls per micro-benchmark run")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per benchmark; the best is kept")
+    parser.add_argument('--alloc-number', type=int, default=200, help="calls traced for allocations")
+    parser.add_argument('--games', type=int, default=5, help="games per game-loop run")
+    parser.add_argument('--max-pieces', type=int, default=500)
+    parser.add_argument('--output', default=os.path.join('bench_results', 'results.json'))
+    parser.add_argument('--baseline', help="earlier results file to compare against")
+    parser.add_argument('--reference', help="engine in this run to compare the others against")
+    args = parser.parse_args()
+
+    results = run_suite(args.engines, args.benches, args.seed, args.number, args.repeat,
+                        args.alloc_number, args.games, args.max_pieces)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    print(report(results, baseline, args.reference))
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'settings': {key: getattr(args, key) for key in
+                         ('number', 'repeat', 'alloc_number', 'games', 'max_pieces')},
+            'results': results
+        }, f, indent=2)
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
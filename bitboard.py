@@ -0,0 +1,146 @@
+from constants import GRID_WIDTH, GRID_HEIGHT
+from board import Board, EMPTY_ROW
+from pieces import SHIFTED, X_PAD
+from zobrist import CELL_KEYS, row_hash
+
+FULL_MASK = (1 << GRID_WIDTH) - 1
+MAX_PENDING = 1024  # Queued colour-plane writes before they are applied anyway
+
+
+def rows_heights(rows):
+    heights = [0] * GRID_WIDTH
+    seen = 0
+    for y, row in enumerate(rows):
+        new = row & ~seen
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = GRID_HEIGHT - y
+            new ^= low
+        seen |= row
+        if seen == FULL_MASK:
+            break
+    return heights
+
+
+class BitBoard(Board):
+    # rows[y] has bit x set when cell (x, y) is occupied, and is all the game
+    # logic reads. rows, row_hashes and heights are lists updated in place,
+    # so a lock touches a few ints instead of rebuilding tuples; snapshots
+    # take copies. The palette-index grid is only needed by the renderer and
+    # snapshots, so placements and clears are queued and applied when grid
+    # is read. row_fill and column_fill are computed when asked for.
+
+    def reset_cells(self):
+        self.rows = [0] * GRID_HEIGHT
+        self.row_hashes = [0] * GRID_HEIGHT
+        self.hash = 0
+        self.heights = [0] * GRID_WIDTH
+        self._grid = (EMPTY_ROW,) * GRID_HEIGHT
+        self.pending = []  # (cells, palette index), or (cleared rows, None)
+
+    def restore_cells(self, snapshot):
+        self.rows = list(snapshot.rows)
+        self.row_hashes = list(snapshot.row_hashes)
+        self.hash = snapshot.hash
+        self.heights = list(snapshot.heights)
+        self._grid = snapshot.grid
+        self.pending = []
+
+    @property
+    def grid(self):
+        if self.pending:
+            self.apply_pending()
+        return self._grid
+
+    @property
+    def row_fill(self):
+        return tuple(row.bit_count() for row in self.rows)
+
+    @property
+    def column_fill(self):
+        return tuple(sum(row >> x & 1 for row in self.rows) for x in range(GRID_WIDTH))
+
+    def apply_pending(self):
+        # Rows are copied to lists once per batch rather than once per cell,
+        # and untouched rows stay shared with earlier snapshots
+        grid = list(self._grid)
+        for cells, index in self.pending:
+            if index is None:
+                cleared = set(cells)
+                grid = [EMPTY_ROW] * len(cells) + [grid[y] for y in range(GRID_HEIGHT)
+                                                   if y not in cleared]
+                continue
+            for x, y in cells:
+                row = grid[y]
+                if type(row) is tuple:
+                    row = grid[y] = list(row)
+                row[x] = index
+        self._grid = tuple(row if type(row) is tuple else tuple(row) for row in grid)
+        self.pending = []
+
+    def check_collision(self, piece):
+        # SHIFTED holds every piece's row masks pre-shifted to each column
+        x = piece.x
+        if not -X_PAD <= x < GRID_WIDTH:
+            return True
+        masks = SHIFTED[piece.shape_name][piece.rotation][x + X_PAD]
+        if masks is None:
+            return True
+        rows = self.rows
+        y = piece.y
+        for dy, mask in masks:
+            row = y + dy
+            if row >= GRID_HEIGHT:
+                return True
+            if row >= 0 and rows[row] & mask:
+                return True
+        return False
+
+    def row_mask(self, y):
+        return self.rows[y]
+
+    def place_cells(self, cells, index):
+        rows = self.rows
+        heights = self.heights
+        row_hashes = self.row_hashes
+        h = self.hash
+        for x, y in cells:
+            rows[y] |= 1 << x
+            if GRID_HEIGHT - y > heights[x]:
+                heights[x] = GRID_HEIGHT - y
+            key = CELL_KEYS[y][x]
+            row_hashes[y] ^= key
+            h ^= key
+        self.hash = h
+        pending = self.pending
+        pending.append((cells, index))
+        if len(pending) >= MAX_PENDING:
+            self.apply_pending()
+        if self.dirty_rows is not None:
+            self.dirty_rows.update(y for _, y in cells)
+
+    def is_full(self, y):
+        return self.rows[y] == FULL_MASK
+
+    def remove_rows(self, lines_to_clear):
+        cleared = set(lines_to_clear)
+        kept = [y for y in range(GRID_HEIGHT) if y not in cleared]
+        rows = self.rows
+        rows[:] = [0] * len(lines_to_clear) + [rows[y] for y in kept]
+        self.pending.append((list(lines_to_clear), None))
+        return kept
+
+    def rehash_rows(self, rows):
+        row_hashes = self.row_hashes
+        for y in rows:
+            h = row_hash(y, self.rows[y])
+            self.hash ^= row_hashes[y] ^ h
+            row_hashes[y] = h
+
+    def refresh_heights(self, num_lines):
+        self.heights = rows_heights(self.rows)
+
+    def snapshot(self):
+        return super().snapshot()._replace(rows=tuple(self.rows),
+                                           row_hashes=tuple(self.row_hashes),
+                                           heights=tuple(self.heights))
\ No newline at end of file
@@ -1,53 +1,222 @@
-from constants import GRID_WIDTH, GRID_HEIGHT, SCORE_SINGLE, SCORE_DOUBLE, SCORE_TRIPLE, SCORE_TETRIS
+import random
+from collections import namedtuple
+from constants import GRID_WIDTH, GRID_HEIGHT, EMPTY, SCORE_SINGLE, SCORE_DOUBLE, SCORE_TRIPLE, SCORE_TETRIS
+from constants import INITIAL_FALL_SPEED, SOFT_DROP_SPEED, LEVEL_SPEED_INCREASE, SCORE_HARD_DROP
+from constants import SHAPES, INSTANT_GRAVITY_LEVEL, LOCK_DELAY
 from pieces import Piece
+from zobrist import CELL_KEYS, row_hash
+
+PIECE_NAMES = list(SHAPES)
+EMPTY_ROW = (EMPTY,) * GRID_WIDTH
+SEED_MASK = (1 << 64) - 1
+
+# Immutable board state. The board replaces its tuples instead of mutating
+# them, so taking or restoring a snapshot only copies references and
+# consecutive snapshots share every row a move did not touch.
+Snapshot = namedtuple('Snapshot', [
+    'grid', 'rows', 'row_hashes', 'hash', 'row_fill', 'column_fill', 'heights',
+    'piece', 'stream_index', 'score', 'level', 'lines_cleared', 'game_over',
+    'fall_time'
+])
 
 class Board:
-    def __init__(self):
-        self.grid = [[None for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+    def __init__(self, seed=None):
+        # Every board draws its pieces from its own seeded generator, so a
+        # game is fully determined by its seed and its inputs
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed & SEED_MASK  # Replay files store it as 64 unsigned bits
+        self.rng = random.Random(self.seed)
+        self.stream = []  # Every piece name drawn so far, in order
+        self.stream_index = 0
+        self.reset_cells()
         self.current_piece = None
-        self.next_piece = Piece()
+        self.next_piece = self.new_piece()
         self.score = 0
         self.level = 1
         self.lines_cleared = 0
         self.game_over = False
+        self.fall_time = 0  # Milliseconds of gravity accumulated since the last step
+        self.dirty_rows = None  # Set of rows changed since the last frame, once a renderer asks
+
+    def reset_cells(self):
+        # An empty well
+        self.grid = (EMPTY_ROW,) * GRID_HEIGHT
+
+        # Zobrist hash of the locked cells, kept per row so a line clear only
+        # rehashes the rows it shifted
+        self.row_hashes = (0,) * GRID_HEIGHT
+        self.hash = 0
+
+        # Filled cells per row and per column, and column heights (0 for an
+        # empty column), maintained by place_cells and clear_lines
+        self.row_fill = (0,) * GRID_HEIGHT
+        self.column_fill = (0,) * GRID_WIDTH
+        self.heights = (0,) * GRID_WIDTH
+
+    def extend_stream(self, length):
+        # Draw pieces until the stream holds `length` names. The stream only
+        # grows, so a restored snapshot replays the same pieces without
+        # having to save the generator state - also on another board with
+        # the same seed that hasn't drawn that far yet
+        while len(self.stream) < length:
+            self.stream.append(self.rng.choice(PIECE_NAMES))
+
+    def new_piece(self):
+        self.extend_stream(self.stream_index + 1)
+        name = self.stream[self.stream_index]
+        self.stream_index += 1
+        return Piece(name)
 
     def spawn_piece(self):
         self.current_piece = self.next_piece
-        self.next_piece = Piece()
+        self.next_piece = self.new_piece()
         if self.check_collision(self.current_piece):
             self.game_over = True
 
     def check_collision(self, piece):
-        for x, y in piece.get_positions():
+        px, py = piece.x, piece.y
+        for dx, dy in piece.cells:
+            x, y = px + dx, py + dy
             if (x < 0 or x >= GRID_WIDTH or 
                 y >= GRID_HEIGHT or 
-                (y >= 0 and self.grid[y][x] is not None)):
+                (y >= 0 and self.grid[y][x] != EMPTY)):
                 return True
         return False
 
     def lock_piece(self):
-        for x, y in self.current_piece.get_positions():
-            if y >= 0:
-                self.grid[y][x] = self.current_piece.color
-        self.clear_lines()
+        piece = self.current_piece
+        cells = [(piece.x + dx, piece.y + dy) for dx, dy in piece.cells if piece.y + dy >= 0]
+        self.place_cells(cells, piece.color_index)
+        self.clear_lines({y for _, y in cells})
         self.spawn_piece()
 
-    def clear_lines(self):
-        lines_to_clear = []
-        for y in range(GRID_HEIGHT):
-            if all(cell is not None for cell in self.grid[y]):
-                lines_to_clear.append(y)
+    def place_cells(self, cells, index):
+        grid = list(self.grid)
+        row_hashes = list(self.row_hashes)
+        row_fill = list(self.row_fill)
+        column_fill = list(self.column_fill)
+        heights = list(self.heights)
+        for x, y in cells:
+            row = grid[y]
+            grid[y] = row[:x] + (index,) + row[x + 1:]
+            key = CELL_KEYS[y][x]
+            row_hashes[y] ^= key
+            self.hash ^= key
+            row_fill[y] += 1
+            column_fill[x] += 1
+            if GRID_HEIGHT - y > heights[x]:
+                heights[x] = GRID_HEIGHT - y
+        self.grid = tuple(grid)
+        self.row_hashes = tuple(row_hashes)
+        self.row_fill = tuple(row_fill)
+        self.column_fill = tuple(column_fill)
+        self.heights = tuple(heights)
+        # Locked cells can land where the piece was never drawn (hard drop,
+        # 20G, several ticks in one frame), so the renderer repaints the rows
+        if self.dirty_rows is not None:
+            self.dirty_rows.update(y for _, y in cells)
 
-        for y in lines_to_clear:
-            del self.grid[y]
-            self.grid.insert(0, [None for _ in range(GRID_WIDTH)])
+    def clear_lines(self, rows=None):
+        # Only rows the last piece touched can have become full
+        if rows is None:
+            rows = range(GRID_HEIGHT)
+        lines_to_clear = sorted(y for y in rows if self.is_full(y))
 
         num_lines = len(lines_to_clear)
         if num_lines > 0:
+            self.remove_rows(lines_to_clear)
+            shifted = range(lines_to_clear[-1] + 1)
+            if self.dirty_rows is not None:
+                self.dirty_rows.update(shifted)
+            self.rehash_rows(shifted)
+            self.refresh_heights(num_lines)
             self.update_score(num_lines)
             self.lines_cleared += num_lines
             self.level = self.lines_cleared // 10 + 1
 
+    def is_full(self, y):
+        return self.row_fill[y] == GRID_WIDTH
+
+    def remove_rows(self, lines_to_clear):
+        cleared = set(lines_to_clear)
+        kept = [y for y in range(GRID_HEIGHT) if y not in cleared]
+        num_lines = len(lines_to_clear)
+        grid = self.grid
+        row_fill = self.row_fill
+        self.grid = (EMPTY_ROW,) * num_lines + tuple(grid[y] for y in kept)
+        self.row_fill = (0,) * num_lines + tuple(row_fill[y] for y in kept)
+        return kept
+
+    def refresh_heights(self, num_lines):
+        # Every cleared row was full, so each column lost num_lines cells;
+        # its new top is found by scanning down from the old one
+        grid = self.grid
+        heights = list(self.heights)
+        for x in range(GRID_WIDTH):
+            height = heights[x]
+            if height == 0:
+                continue
+            y = GRID_HEIGHT - height
+            while y < GRID_HEIGHT and grid[y][x] == EMPTY:
+                y += 1
+            heights[x] = GRID_HEIGHT - y
+        self.heights = tuple(heights)
+        self.column_fill = tuple(fill - num_lines for fill in self.column_fill)
+
+    def row_mask(self, y):
+        mask = 0
+        for x, cell in enumerate(self.grid[y]):
+            if cell != EMPTY:
+                mask |= 1 << x
+        return mask
+
+    def rehash_rows(self, rows):
+        row_hashes = list(self.row_hashes)
+        for y in rows:
+            h = row_hash(y, self.row_mask(y))
+            self.hash ^= row_hashes[y] ^ h
+            row_hashes[y] = h
+        self.row_hashes = tuple(row_hashes)
+
+    def snapshot(self):
+        piece = self.current_piece
+        if piece is not None:
+            piece = (piece.shape_name, piece.rotation, piece.x, piece.y)
+        return Snapshot(self.grid, None, self.row_hashes, self.hash, self.row_fill,
+                        self.column_fill, self.heights, piece, self.stream_index,
+                        self.score, self.level, self.lines_cleared, self.game_over,
+                        self.fall_time)
+
+    def restore_cells(self, snapshot):
+        self.grid = snapshot.grid
+        self.row_hashes = snapshot.row_hashes
+        self.hash = snapshot.hash
+        self.row_fill = snapshot.row_fill
+        self.column_fill = snapshot.column_fill
+        self.heights = snapshot.heights
+
+    def restore(self, snapshot):
+        self.restore_cells(snapshot)
+        self.stream_index = snapshot.stream_index
+        self.score = snapshot.score
+        self.level = snapshot.level
+        self.lines_cleared = snapshot.lines_cleared
+        self.game_over = snapshot.game_over
+        self.fall_time = snapshot.fall_time
+
+        self.current_piece = None
+        if snapshot.piece is not None:
+            name, rotation, x, y = snapshot.piece
+            self.current_piece = Piece(name)
+            self.current_piece.rotation = rotation
+            self.current_piece.x = x
+            self.current_piece.y = y
+        self.extend_stream(self.stream_index)
+        self.next_piece = Piece(self.stream[self.stream_index - 1])
+        if self.dirty_rows is not None:
+            self.dirty_rows.update(range(GRID_HEIGHT))
+
     def update_score(self, num_lines):
         score_map = {
             1: SCORE_SINGLE,
@@ -72,6 +241,50 @@ class Board:
         if self.check_collision(self.current_piece):
             self.current_piece.rotation = original_rotation
 
+    def fall_speed(self, soft_drop=False):
+        if soft_drop:
+            return SOFT_DROP_SPEED
+        return INITIAL_FALL_SPEED * (LEVEL_SPEED_INCREASE ** (self.level - 1))
+
+    def apply_gravity(self, dt, soft_drop=False):
+        # dt is a fixed tick length in milliseconds, so the same sequence of
+        # ticks always produces the same sequence of drops
+        interval = 1000 / self.fall_speed(soft_drop)
+        if self.level >= INSTANT_GRAVITY_LEVEL:
+            # 20G: the piece reaches the stack the moment it appears or moves,
+            # and locks after a fixed delay rather than the slow fall interval
+            self.current_piece.move(0, self.drop_distance(self.current_piece))
+            interval = min(interval, LOCK_DELAY)
+        self.fall_time += dt
+        if self.fall_time >= interval:
+            self.move_current_piece(0, 1)
+            self.fall_time = 0
+
+    def drop_distance(self, piece):
+        # Rows the piece can fall before it lands. While the piece is above
+        # the stack this compares its lowest cell per column against the
+        # column heights; under an overhang it falls back to stepping down.
+        distance = GRID_HEIGHT
+        heights = self.heights
+        for dx, dy in piece.bottom:
+            gap = GRID_HEIGHT - heights[piece.x + dx] - (piece.y + dy) - 1
+            if gap < 0:
+                return self.step_distance(piece)
+            if gap < distance:
+                distance = gap
+        return distance
+
+    def step_distance(self, piece):
+        distance = 0
+        piece.move(0, 1)
+        while not self.check_collision(piece):
+            distance += 1
+            piece.move(0, 1)
+        piece.move(0, -distance - 1)
+        return distance
+
     def hard_drop(self):
-        while self.move_current_piece(0, 1):
-            self.score += SCORE_HARD_DROP
\ No newline at end of file
+        distance = self.drop_distance(self.current_piece)
+        self.current_piece.move(0, distance)
+        self.score += SCORE_HARD_DROP * distance
+        self.lock_piece()
\ No newline at end of file
@@ -1,5 +1,3 @@
-import pygame
-
 # Window dimensions
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
@@ -23,11 +21,21 @@ COLORS = {
     'L': (255, 128, 0)     # Orange
 }
 
+# Board cells store a palette index instead of a color tuple (0 = empty)
+EMPTY = 0
+PALETTE = [BLACK] + list(COLORS.values())
+COLOR_INDEX = {name: index for index, name in enumerate(COLORS, 1)}
+
 # Game settings
 FPS = 60
 INITIAL_FALL_SPEED = 1.0  # Blocks per second
 SOFT_DROP_SPEED = 20.0
 LEVEL_SPEED_INCREASE = 0.8  # Multiplier for each level
+INSTANT_GRAVITY_LEVEL = 20  # From this level pieces drop to the stack at once (20G)
+LOCK_DELAY = 500  # Milliseconds a landed piece waits before locking under 20G
+LOGIC_RATE = 60  # Fixed simulation ticks per second
+MAX_CATCH_UP_TICKS = 5  # Ticks simulated at most per frame before dropping time
+UNDO_LIMIT = 100  # Placements that can be taken back in practice mode
 
 # Scoring system
 SCORE_SINGLE = 100
@@ -75,7 +83,6 @@ SHAPES = {
     ]
 }
 
-# Initialize display info
-pygame.init()
+# Game area placement
 GAME_AREA_OFFSET_X = (WINDOW_WIDTH - GRID_WIDTH * BLOCK_SIZE) // 2
 GAME_AREA_OFFSET_Y = (WINDOW_HEIGHT - GRID_HEIGHT * BLOCK_SIZE) // 2
\ No newline at end of file
@@ -0,0 +1,120 @@
+import numpy as np
+from constants import GRID_WIDTH, GRID_HEIGHT
+from board import PIECE_NAMES
+from bitboard import BitBoard
+from ai import reachable_placements
+from batch import place
+
+# Reinforcement-learning wrapper around the headless board.
+# An action is a hard-drop placement: rotation * GRID_WIDTH + column, where
+# column is the leftmost column the rotated piece occupies.
+MAX_ROTATIONS = 4
+NUM_ACTIONS = MAX_ROTATIONS * GRID_WIDTH
+PIECE_IDS = {name: index for index, name in enumerate(PIECE_NAMES)}
+
+BIT_INDEX = np.arange(GRID_WIDTH)
+
+
+def encode_action(piece, rotation, x):
+    return rotation * GRID_WIDTH + x + piece.geometry[rotation].bbox[0]
+
+
+def decode_action(piece, action):
+    rotation, column = divmod(int(action), GRID_WIDTH)
+    rotation %= len(piece.shape)
+    return rotation, column - piece.geometry[rotation].bbox[0]
+
+
+def occupancy_from_rows(rows):
+    # Row bitmasks of shape (..., H) to a (..., H, W) 0/1 occupancy array
+    return ((np.asarray(rows, dtype=np.int64)[..., None] >> BIT_INDEX) & 1).astype(np.uint8)
+
+
+def row_masks(board):
+    if isinstance(board, BitBoard):
+        return board.rows
+    return [board.row_mask(y) for y in range(GRID_HEIGHT)]
+
+
+class TetrisEnv:
+    def __init__(self, seed=None, board_class=BitBoard, max_steps=None):
+        self.board_class = board_class
+        self.max_steps = max_steps
+        self.seed = seed
+        self.board = None
+        self.steps = 0
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        self.board = self.board_class(self.seed)
+        self.board.spawn_piece()
+        if self.seed is not None:
+            self.seed += 1  # Next episode gets a fresh, still reproducible stream
+        self.steps = 0
+        return self.observation(), {}
+
+    def observation(self):
+        board = self.board
+        return {
+            'board': occupancy_from_rows(row_masks(board)),
+            'piece': PIECE_IDS[board.current_piece.shape_name],
+            'next': PIECE_IDS[board.next_piece.shape_name]
+        }
+
+    def action_mask(self):
+        mask = np.zeros(NUM_ACTIONS, dtype=bool)
+        piece = self.board.current_piece
+        for rotation, x in reachable_placements(self.board, piece):
+            mask[encode_action(piece, rotation, x)] = True
+        return mask
+
+    def step(self, action):
+        # Returns (observation, reward, terminated, truncated, info); the
+        # reward is the score gained by the placement. Unreachable actions
+        # are played as far as the piece can get towards them.
+        board = self.board
+        score, lines = board.score, board.lines_cleared
+        place(board, *decode_action(board.current_piece, action))
+        self.steps += 1
+        terminated = board.game_over
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+        info = {'lines': board.lines_cleared - lines, 'score': board.score}
+        return self.observation(), board.score - score, terminated, truncated, info
+
+
+class VecTetrisEnv:
+    # K boards stepped together; observations are stacked arrays and an
+    # environment that finishes is reset in place, as in gym vector envs
+    def __init__(self, num_envs, seed=0, board_class=BitBoard, max_steps=None):
+        self.envs = [TetrisEnv(seed + i * 1000003, board_class, max_steps)
+                     for i in range(num_envs)]
+        self.num_envs = num_envs
+
+    def reset(self):
+        for env in self.envs:
+            env.reset()
+        return self.observation(), {}
+
+    def observation(self):
+        boards = [env.board for env in self.envs]
+        return {
+            'board': occupancy_from_rows([row_masks(board) for board in boards]),
+            'piece': np.array([PIECE_IDS[b.current_piece.shape_name] for b in boards]),
+            'next': np.array([PIECE_IDS[b.next_piece.shape_name] for b in boards])
+        }
+
+    def action_mask(self):
+        return np.stack([env.action_mask() for env in self.envs])
+
+    def step(self, actions):
+        rewards = np.zeros(self.num_envs)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        lines = np.zeros(self.num_envs, dtype=np.int64)
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            _, rewards[i], terminated[i], truncated[i], info = env.step(action)
+            lines[i] = info['lines']
+            if terminated[i] or truncated[i]:
+                env.reset()
+        return self.observation(), rewards, terminated, truncated, {'lines': lines}
\ No newline at end of file
@@ -0,0 +1,205 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+import numpy as np
+from constants import GRID_WIDTH
+from board import PIECE_NAMES
+from bitboard import BitBoard
+from pieces import Piece
+from ai import (DEFAULT_WEIGHTS, occupancy, reachable_placements, drop_boards,
+                clear_full_rows, evaluate, piece_state)
+
+# Lookahead over the preview: the current piece and every known upcoming
+# piece are searched exhaustively (max nodes), then `chance_depth` further
+# pieces are averaged over the piece odds (chance nodes). Leaves are scored
+# with ai.evaluate; lines cleared on the way are credited with the 'lines'
+# weight. The first ply is fanned out to a process pool, best static branch
+# first, so a search cut short by its time budget or cancel() has still
+# finished the branches most likely to win.
+
+LOSS = float('-inf')
+BIT_VALUES = 1 << np.arange(GRID_WIDTH, dtype=np.int64)
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+class Position:
+    # Just enough of a board for reachable_placements: row occupancy masks
+    check_collision = BitBoard.check_collision
+
+    def __init__(self, filled):
+        self.rows = tuple((filled.astype(np.int64) @ BIT_VALUES).tolist())
+
+
+def uniform_odds(names=PIECE_NAMES):
+    # Board.new_piece draws uniformly from PIECE_NAMES
+    return {name: 1 / len(names) for name in names}
+
+
+def check(deadline, search):
+    # `search` is (current search counter, this search's number): the
+    # search is stale once the counter has moved on
+    if deadline is not None and time.time() > deadline:
+        raise SearchCancelled
+    if search is not None and search[0].value != search[1]:
+        raise SearchCancelled
+
+
+def value(filled, queue, chance_depth, weights, odds, deadline=None, search=None):
+    # Expected score of `filled` with the known `queue` still to place
+    check(deadline, search)
+    if not queue:
+        if not chance_depth:
+            return float(evaluate(filled[None], weights)[0])
+        return sum(p * value(filled, (name,), chance_depth - 1, weights, odds, deadline, search)
+                   for name, p in odds.items())
+
+    piece = Piece(queue[0])
+    placements = reachable_placements(Position(filled), piece)
+    if not placements:
+        return LOSS  # Blocked at spawn
+    _, boards = drop_boards(filled, piece, placements)
+    if len(queue) == 1 and not chance_depth:
+        return float(evaluate(boards, weights).max())
+    boards, lines = clear_full_rows(boards)
+    line_weight = weights.get('lines', 0)
+    return max(line_weight * cleared + value(child, queue[1:], chance_depth, weights, odds,
+                                             deadline, search)
+               for child, cleared in zip(boards, lines))
+
+
+_counter = None  # The pool's shared search counter, set in each worker
+
+
+def init_worker(counter):
+    global _counter
+    _counter = counter
+
+
+def branch_value(filled, lines, queue, chance_depth, weights, odds, deadline, generation):
+    # One first-ply branch; None if the search was cut short or superseded
+    try:
+        return weights.get('lines', 0) * lines + value(filled, queue, chance_depth, weights,
+                                                       odds, deadline, (_counter, generation))
+    except SearchCancelled:
+        return None
+
+
+class ExpectimaxBot:
+    # workers=0 searches in-process; otherwise the pool is started on first
+    # use and kept until close()
+    def __init__(self, weights=DEFAULT_WEIGHTS, chance_depth=1, odds=None,
+                 workers=None, time_limit=None, table=None):
+        self.weights = weights
+        self.chance_depth = chance_depth
+        self.odds = odds or uniform_odds()
+        self.workers = os.cpu_count() if workers is None else workers
+        self.time_limit = time_limit  # Default seconds per choose()
+        self.table = table  # Optional zobrist.TranspositionTable for finished searches
+        # Numbered searches: every choose() and cancel() moves the counter
+        # on, so branches still running for an earlier search stop at their
+        # next check instead of eating into the current one's budget
+        self.counter = multiprocessing.Value('q', 0)
+        self.generation = 0
+        self.executor = None
+        self.completed = 0  # First-ply branches searched to full depth by the last choose()
+
+    def start(self):
+        if self.executor is None and self.workers:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                initializer=init_worker,
+                                                initargs=(self.counter,))
+        return self
+
+    def close(self):
+        if self.executor is not None:
+            self.cancel()
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def cancel(self):
+        # Stop the running choose() (from another thread); it returns the
+        # best branch finished so far
+        with self.counter.get_lock():
+            self.counter.value += 1
+
+    def choose(self, board, preview=None, time_limit=None):
+        # (rotation, x) for board.current_piece. `preview` lists the known
+        # upcoming shape names, by default just board.next_piece; a variant's
+        # next_queue can be passed instead.
+        piece = board.current_piece
+        if preview is None:
+            preview = [board.next_piece.shape_name] if board.next_piece else []
+        queue = tuple(preview)
+        if time_limit is None:
+            time_limit = self.time_limit
+
+        key = None
+        if self.table is not None:
+            key = self.table.key(board.hash, (piece_state(piece), queue))
+            entry = self.table.get(key)
+            if entry is not None:
+                return entry[1]
+
+        placements = reachable_placements(board, piece)
+        if not placements:
+            return piece.rotation, piece.x
+        _, boards = drop_boards(occupancy(board), piece, placements)
+        static = evaluate(boards, self.weights)
+        order = [int(i) for i in np.argsort(-static, kind='stable')]
+        boards, lines = clear_full_rows(boards)
+
+        with self.counter.get_lock():
+            self.counter.value += 1
+            self.generation = self.counter.value
+        deadline = None if time_limit is None else time.time() + time_limit
+        args = [(boards[i], int(lines[i]), queue, self.chance_depth, self.weights,
+                 self.odds, deadline, self.generation) for i in order]
+        if self.workers:
+            scores = self.run_pool(args, deadline)
+        else:
+            scores = self.run_inline(args)
+
+        finished = [(score, i) for score, i in zip(scores, order) if score is not None]
+        self.completed = len(finished)
+        if not finished:
+            return placements[order[0]]  # Out of time: best by static score
+        score, best = max(finished, key=lambda item: item[0])
+        if key is not None and self.completed == len(placements):
+            self.table.put(key, score, placements[best])
+        return placements[best]
+
+    def run_inline(self, args):
+        scores = []
+        for filled, lines, queue, chance_depth, weights, odds, deadline, generation in args:
+            try:
+                scores.append(weights.get('lines', 0) * lines +
+                              value(filled, queue, chance_depth, weights, odds, deadline,
+                                    (self.counter, generation)))
+            except SearchCancelled:
+                break
+        return scores + [None] * (len(args) - len(scores))
+
+    def run_pool(self, args, deadline):
+        self.start()
+        futures = [self.executor.submit(branch_value, *branch) for branch in args]
+        timeout = None if deadline is None else max(0.0, deadline - time.time())
+        done, pending = wait(futures, timeout=timeout)
+        if pending:
+            # Out of time: drop queued branches and stop the running ones
+            self.cancel()
+            for future in pending:
+                future.cancel()
+        return [future.result() if future in done else None for future in futures]
+
+    def __call__(self, board, rng=None):
+        return self.choose(board)
\ No newline at end of file
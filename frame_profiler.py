@@ -0,0 +1,131 @@
+import csv
+import os
+import time
+from array import array
+
+PHASES = ('input', 'update', 'draw')
+COLUMNS = ('frame',) + PHASES
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    # Per-frame phase timings kept in a ring buffer of the last `capacity`
+    # frames. A loop calls begin_frame() at the top of every iteration and
+    # mark(phase) after each phase; whatever is not marked (clock.tick,
+    # sleeping) is the frame's idle time.
+    def __init__(self, capacity=600, csv_path=None, overlay=False, refresh_ms=500):
+        self.capacity = capacity
+        self.csv_path = csv_path
+        self.overlay = overlay
+        self.refresh_ns = refresh_ms * 1_000_000
+        self.samples = {name: array('q', [0]) * capacity for name in COLUMNS}
+        self.count = 0
+        self.current = dict.fromkeys(PHASES, 0)
+        self.frame_start = None
+        self.last = None
+
+        self.overlay_image = None
+        self.overlay_time = 0
+
+    def begin_frame(self):
+        now = time.perf_counter_ns()
+        if self.frame_start is not None:
+            i = self.count % self.capacity
+            self.samples['frame'][i] = now - self.frame_start
+            for phase in PHASES:
+                self.samples[phase][i] = self.current[phase]
+                self.current[phase] = 0
+            self.count += 1
+        self.frame_start = self.last = now
+
+    def mark(self, phase):
+        # Charge the time since the previous mark to `phase`; None leaves the
+        # interval uncharged, so it counts as idle
+        now = time.perf_counter_ns()
+        if phase is not None and self.last is not None:
+            self.current[phase] += now - self.last
+        self.last = now
+
+    def frames(self):
+        # Number of frames currently buffered
+        return min(self.count, self.capacity)
+
+    def column(self, name):
+        # Buffered samples of one column, oldest first
+        values = self.samples[name]
+        if self.count <= self.capacity:
+            return values[:self.count].tolist()
+        start = self.count % self.capacity
+        return (values[start:] + values[:start]).tolist()
+
+    def percentiles(self, name, qs=PERCENTILES):
+        # Nearest-rank percentiles of a column, in milliseconds
+        values = sorted(self.column(name))
+        if not values:
+            return [0.0] * len(qs)
+        n = len(values)
+        return [values[min(n - 1, max(0, -(-q * n // 100) - 1))] / 1e6 for q in qs]
+
+    def fps(self):
+        n = self.frames()
+        total = sum(self.column('frame'))
+        return n * 1e9 / total if total else 0.0
+
+    def overlay_lines(self):
+        lines = [f"FPS {self.fps():.1f}", "ms      p50    p95    p99"]
+        for name in COLUMNS:
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:<7}{p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        return lines
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.overlay_image = None
+
+    def draw_overlay(self, surface, font, pos):
+        # Blit the overlay at `pos`, re-rendering it at most every refresh_ms.
+        # Returns (rect, changed); the box is opaque and never shrinks, so a
+        # caller doing partial updates only has to push the rect on change.
+        import pygame  # Only needed here, so the timing side stays pygame-free
+        now = time.perf_counter_ns()
+        changed = self.overlay_image is None or now - self.overlay_time >= self.refresh_ns
+        if changed:
+            labels = [font.render(line, True, (255, 255, 255)) for line in self.overlay_lines()]
+            width = max(label.get_width() for label in labels) + 8
+            height = sum(label.get_height() for label in labels) + 8
+            if self.overlay_image is not None:
+                width = max(width, self.overlay_image.get_width())
+                height = max(height, self.overlay_image.get_height())
+            image = pygame.Surface((width, height))
+            image.fill((0, 0, 0))
+            y = 4
+            for label in labels:
+                image.blit(label, (4, y))
+                y += label.get_height()
+            self.overlay_image = image
+            self.overlay_time = now
+        return surface.blit(self.overlay_image, pos), changed
+
+    def dump_csv(self, path=None):
+        path = path or self.csv_path
+        if not path:
+            return
+        columns = [self.column(name) for name in COLUMNS]
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([f"{name}_ns" for name in COLUMNS] + ['idle_ns'])
+            for row in zip(*columns):
+                writer.writerow(list(row) + [row[0] - sum(row[1:])])
+
+    def close(self):
+        # Call on exit: writes the buffer to csv_path if one was given
+        self.dump_csv()
+
+
+def profiler_from_env():
+    # FRAME_PROFILE=<csv path> turns profiling on for the entry points;
+    # FRAME_OVERLAY=1 also shows the overlay from the start (F3 toggles it)
+    path = os.environ.get('FRAME_PROFILE')
+    if not path:
+        return None
+    return FrameProfiler(csv_path=path, overlay=os.environ.get('FRAME_OVERLAY') == '1')
\ No newline at end of file
@@ -1,18 +1,65 @@
+import time
 import pygame
 from constants import *
 from board import Board
+from sprites import BLOCK_STYLES, SpriteCache
+from text_cache import TextCache
+import replay
+from undo import UndoHistory
 
 class Game:
-    def __init__(self):
+    def __init__(self, board_class=Board, dirty_rects=False, block_style='flat',
+                 logic_rate=LOGIC_RATE, render_rate=FPS, interpolate=False,
+                 seed=None, record=None, show_ghost=False, practice=False,
+                 profiler=None):
+        if block_style not in BLOCK_STYLES:
+            raise ValueError(f"unknown block style {block_style!r}, expected one of {BLOCK_STYLES}")
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Tetris")
         self.clock = pygame.time.Clock()
-        self.board = Board()
-        self.fall_time = 0
-        self.fall_speed = INITIAL_FALL_SPEED
+        self.board = board_class(seed)
+        self.soft_drop = False
         self.paused = False
+
+        # Fixed-timestep loop: the simulation advances in ticks of tick_ms,
+        # rendering runs at its own rate and may interpolate between ticks
+        self.logic_rate = logic_rate
+        self.render_rate = render_rate
+        self.tick_ms = 1000 / logic_rate
+        self.ticks = 0
+        self.interpolate = interpolate
+        self.alpha = 0.0
+
+        # Optional input recording, written to the `record` path on exit
+        self.record_path = record
+        self.recorder = replay.ReplayRecorder(self.board.seed, logic_rate) if record else None
+
+        # Practice mode: Z takes back the last placement
+        self.history = UndoHistory(self.board) if practice else None
+
+        # Optional frame_profiler.FrameProfiler; F3 toggles its overlay
+        self.profiler = profiler
+        self.overlay_font = pygame.font.Font(None, 20) if profiler else None
+        self.overlay_pos = (10, WINDOW_HEIGHT - 130)
         self.font = pygame.font.Font(None, 36)
+        self.sprites = SpriteCache()
+        self.text = TextCache()
+        self.block_style = block_style
+        self.show_ghost = show_ghost
+
+        # Dirty-rectangle rendering: only cells that changed since the last
+        # frame are redrawn and pushed with pygame.display.update(rects)
+        self.dirty_rects = dirty_rects
+        if dirty_rects:
+            self.board.dirty_rows = set()  # The board only tracks changed rows on request
+        self.drawn_footprint = None
+        self.drawn_hud = None
+        field_right = GAME_AREA_OFFSET_X + GRID_WIDTH * BLOCK_SIZE + 1
+        self.hud_rects = [
+            pygame.Rect(0, 0, GAME_AREA_OFFSET_X - 1, WINDOW_HEIGHT),
+            pygame.Rect(field_right, 0, WINDOW_WIDTH - field_right, WINDOW_HEIGHT)
+        ]
 
     def handle_input(self):
         for event in pygame.event.get():
@@ -21,34 +68,64 @@ class Game:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:
                     self.paused = not self.paused
+                if event.key == pygame.K_F3 and self.profiler:
+                    self.profiler.toggle_overlay()
+                    self.drawn_hud = None  # Redraw everything under it
+                if event.key == pygame.K_z and self.history and not self.paused:
+                    self.perform(replay.UNDO)
                 if not self.paused and not self.board.game_over:
                     if event.key == pygame.K_LEFT:
-                        self.board.move_current_piece(-1, 0)
+                        self.perform(replay.LEFT)
                     elif event.key == pygame.K_RIGHT:
-                        self.board.move_current_piece(1, 0)
+                        self.perform(replay.RIGHT)
                     elif event.key == pygame.K_UP:
-                        self.board.rotate_current_piece()
+                        self.perform(replay.ROTATE)
                     elif event.key == pygame.K_SPACE:
-                        self.board.hard_drop()
+                        self.perform(replay.HARD_DROP)
         
         if not self.paused and not self.board.game_over:
             keys = pygame.key.get_pressed()
-            if keys[pygame.K_DOWN]:
-                self.fall_speed = SOFT_DROP_SPEED
-            else:
-                self.fall_speed = INITIAL_FALL_SPEED * (LEVEL_SPEED_INCREASE ** (self.board.level - 1))
+            soft_drop = bool(keys[pygame.K_DOWN])
+            if soft_drop != self.soft_drop:
+                self.soft_drop = soft_drop
+                if self.recorder:
+                    self.recorder.record(self.ticks, replay.SOFT_DROP_ON if soft_drop
+                                         else replay.SOFT_DROP_OFF)
         
         return True
 
+    def perform(self, action):
+        if self.recorder:
+            self.recorder.record(self.ticks, action)
+        replay.apply_action(self.board, action, self.history)
+        if self.history:
+            self.history.track()
+
     def update(self):
         if self.paused or self.board.game_over:
             return
 
         # Handle piece falling
-        self.fall_time += self.clock.get_rawtime()
-        if self.fall_time >= 1000 / self.fall_speed:
-            self.board.move_current_piece(0, 1)
-            self.fall_time = 0
+        self.board.apply_gravity(self.tick_ms, self.soft_drop)
+        self.ticks += 1
+        if self.history:
+            self.history.track()
+
+    def fall_offset(self):
+        # Fraction of a cell the current piece has fallen towards its next
+        # gravity step, used to interpolate its position between ticks
+        board = self.board
+        piece = board.current_piece
+        if (not self.interpolate or self.dirty_rects or self.paused or
+                board.game_over or not piece):
+            return 0
+        piece.y += 1
+        blocked = board.check_collision(piece)
+        piece.y -= 1
+        if blocked:
+            return 0
+        interval = 1000 / board.fall_speed(self.soft_drop)
+        return min(1.0, (board.fall_time + self.alpha * self.tick_ms) / interval)
 
     def draw_grid(self):
         # Draw background
@@ -61,69 +138,208 @@ class Game:
 
         # Draw grid
         for y in range(GRID_HEIGHT):
+            row = self.board.grid[y]
             for x in range(GRID_WIDTH):
-                color = self.board.grid[y][x]
-                if color:
-                    pygame.draw.rect(self.screen, color,
-                                   (GAME_AREA_OFFSET_X + x * BLOCK_SIZE,
-                                    GAME_AREA_OFFSET_Y + y * BLOCK_SIZE,
-                                    BLOCK_SIZE - 1, BLOCK_SIZE - 1))
+                if row[x]:
+                    self.screen.blit(self.block(row[x]),
+                                     (GAME_AREA_OFFSET_X + x * BLOCK_SIZE,
+                                      GAME_AREA_OFFSET_Y + y * BLOCK_SIZE))
+
+        # Draw landing preview
+        piece = self.board.current_piece
+        if piece and self.show_ghost:
+            sprite = self.block(piece.color_index, 'ghost')
+            ghost_y = piece.y + self.board.drop_distance(piece)
+            for dx, dy in piece.cells:
+                if ghost_y + dy >= 0:
+                    self.screen.blit(sprite,
+                                     (GAME_AREA_OFFSET_X + (piece.x + dx) * BLOCK_SIZE,
+                                      GAME_AREA_OFFSET_Y + (ghost_y + dy) * BLOCK_SIZE))
 
         # Draw current piece
-        if self.board.current_piece:
-            for x, y in self.board.current_piece.get_positions():
+        if piece:
+            sprite = self.block(piece.color_index)
+            offset = int(self.fall_offset() * BLOCK_SIZE)
+            for dx, dy in piece.cells:
+                x, y = piece.x + dx, piece.y + dy
                 if y >= 0:
-                    pygame.draw.rect(self.screen, self.board.current_piece.color,
-                                   (GAME_AREA_OFFSET_X + x * BLOCK_SIZE,
-                                    GAME_AREA_OFFSET_Y + y * BLOCK_SIZE,
-                                    BLOCK_SIZE - 1, BLOCK_SIZE - 1))
+                    self.screen.blit(sprite,
+                                     (GAME_AREA_OFFSET_X + x * BLOCK_SIZE,
+                                      GAME_AREA_OFFSET_Y + y * BLOCK_SIZE + offset))
+
+    def block(self, index, style=None):
+        return self.sprites.get(index, BLOCK_SIZE, style or self.block_style)
 
     def draw_ui(self):
         # Draw score
-        score_text = self.font.render(f"Score: {self.board.score}", True, WHITE)
+        score_text = self.text.label("score", self.font, f"Score: {self.board.score}", WHITE)
         self.screen.blit(score_text, (20, 20))
 
         # Draw level
-        level_text = self.font.render(f"Level: {self.board.level}", True, WHITE)
+        level_text = self.text.label("level", self.font, f"Level: {self.board.level}", WHITE)
         self.screen.blit(level_text, (20, 60))
 
         # Draw lines cleared
-        lines_text = self.font.render(f"Lines: {self.board.lines_cleared}", True, WHITE)
+        lines_text = self.text.label("lines", self.font, f"Lines: {self.board.lines_cleared}", WHITE)
         self.screen.blit(lines_text, (20, 100))
 
         # Draw next piece
-        next_text = self.font.render("Next:", True, WHITE)
+        next_text = self.text.render(self.font, "Next:", WHITE)
         self.screen.blit(next_text, (WINDOW_WIDTH - 150, 20))
 
         # Draw next piece preview
         next_piece = self.board.next_piece
-        for x, y in next_piece.get_positions():
-            pygame.draw.rect(self.screen, next_piece.color,
-                           (WINDOW_WIDTH - 140 + x * BLOCK_SIZE,
-                            60 + y * BLOCK_SIZE,
-                            BLOCK_SIZE - 1, BLOCK_SIZE - 1))
+        sprite = self.block(next_piece.color_index)
+        for dx, dy in next_piece.cells:
+            self.screen.blit(sprite,
+                             (WINDOW_WIDTH - 140 + (next_piece.x + dx) * BLOCK_SIZE,
+                              60 + (next_piece.y + dy) * BLOCK_SIZE))
 
         # Draw game over or paused text
         if self.board.game_over:
-            game_over_text = self.font.render("GAME OVER", True, WHITE)
+            game_over_text = self.text.render(self.font, "GAME OVER", WHITE)
             text_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
             self.screen.blit(game_over_text, text_rect)
         elif self.paused:
-            pause_text = self.font.render("PAUSED", True, WHITE)
+            pause_text = self.text.render(self.font, "PAUSED", WHITE)
             text_rect = pause_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
             self.screen.blit(pause_text, text_rect)
 
-    def draw(self):
+    def piece_footprint(self):
+        # Cells covered by the piece and its landing preview, mapped to the
+        # (palette index, sprite style) drawn there
+        piece = self.board.current_piece
+        if not piece:
+            return {}
+        footprint = {}
+        if self.show_ghost:
+            ghost_y = piece.y + self.board.drop_distance(piece)
+            for dx, dy in piece.cells:
+                if ghost_y + dy >= 0:
+                    footprint[(piece.x + dx, ghost_y + dy)] = (piece.color_index, 'ghost')
+        for dx, dy in piece.cells:
+            if piece.y + dy >= 0:
+                footprint[(piece.x + dx, piece.y + dy)] = (piece.color_index, None)
+        return footprint
+
+    def draw_cell(self, x, y, index, style=None):
+        rect = pygame.Rect(GAME_AREA_OFFSET_X + x * BLOCK_SIZE,
+                           GAME_AREA_OFFSET_Y + y * BLOCK_SIZE,
+                           BLOCK_SIZE, BLOCK_SIZE)
+        if index:
+            self.screen.blit(self.block(index, style), rect)
+        else:
+            self.screen.fill(BLACK, rect)
+        return rect
+
+    def draw_dirty(self):
+        board = self.board
+        footprint = self.piece_footprint()
+        next_piece = board.next_piece
+        hud = (board.score, board.level, board.lines_cleared,
+               next_piece.shape_name, next_piece.rotation,
+               board.game_over, self.paused)
+
+        # The first frame and overlay changes need the whole screen
+        if self.drawn_hud is None or hud[5:] != self.drawn_hud[5:]:
+            self.draw_full()
+        else:
+            cells = {cell for cell in footprint
+                     if footprint[cell] != self.drawn_footprint.get(cell)}
+            cells.update(cell for cell in self.drawn_footprint
+                         if cell not in footprint)
+            for y in board.dirty_rows:
+                cells.update((x, y) for x in range(GRID_WIDTH))
+
+            if board.game_over or self.paused:
+                # Cells under the overlay text cannot be patched in place
+                if cells or hud != self.drawn_hud:
+                    self.draw_full()
+            else:
+                rects = [self.draw_cell(x, y, *(footprint.get((x, y)) or (board.grid[y][x],)))
+                         for x, y in cells]
+                if hud != self.drawn_hud:
+                    for rect in self.hud_rects:
+                        self.screen.fill(BLACK, rect)
+                    self.draw_ui()
+                    rects.extend(self.hud_rects)
+                if self.profiler and self.profiler.overlay:
+                    rect, changed = self.draw_overlay()
+                    if changed or hud != self.drawn_hud:
+                        rects.append(rect)
+                if rects:
+                    pygame.display.update(rects)
+
+        board.dirty_rows.clear()
+        self.drawn_footprint = footprint
+        self.drawn_hud = hud
+
+    def draw_overlay(self):
+        return self.profiler.draw_overlay(self.screen, self.overlay_font, self.overlay_pos)
+
+    def draw_full(self):
         self.draw_grid()
         self.draw_ui()
+        if self.profiler and self.profiler.overlay:
+            self.draw_overlay()
         pygame.display.flip()
 
-    def run(self):
+    def draw(self):
+        if self.dirty_rects:
+            self.draw_dirty()
+        else:
+            self.draw_full()
+
+    def run(self, max_catch_up=MAX_CATCH_UP_TICKS, unthrottled=False):
+        # With unthrottled=True every loop iteration advances one tick no
+        # matter how much wall time passed, so headless runs go as fast as
+        # the simulation allows; render_rate=None skips drawing entirely
         self.board.spawn_piece()
+        if self.history:
+            self.history.track()
+        tick_time = self.tick_ms / 1000
+        render_time = 1 / self.render_rate if self.render_rate else None
+        accumulator = 0.0
+        previous = time.perf_counter()
+        next_render = previous
+        profiler = self.profiler
         running = True
         while running:
-            self.clock.tick(FPS)
+            if profiler:
+                profiler.begin_frame()
+            now = time.perf_counter()
+            if unthrottled:
+                accumulator = tick_time
+            else:
+                accumulator = min(accumulator + now - previous,
+                                  max_catch_up * tick_time)
+            previous = now
+
             running = self.handle_input()
-            self.update()
-            self.draw()
+            if profiler:
+                profiler.mark('input')
+            while accumulator >= tick_time:
+                self.update()
+                accumulator -= tick_time
+            self.alpha = accumulator / tick_time
+            if profiler:
+                profiler.mark('update')
+
+            if render_time is not None and now >= next_render:
+                self.draw()
+                if profiler:
+                    profiler.mark('draw')
+                self.clock.tick()
+                next_render = max(next_render + render_time, now)
+            elif not unthrottled:
+                wake = previous + tick_time - accumulator
+                if render_time is not None:
+                    wake = min(wake, next_render)
+                delay = wake - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        if self.recorder:
+            self.recorder.save(self.record_path, self.ticks)
+        if profiler:
+            profiler.close()
         pygame.quit()
\ No newline at end of file
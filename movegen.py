@@ -0,0 +1,184 @@
+from collections import OrderedDict, deque, namedtuple
+from constants import GRID_WIDTH, GRID_HEIGHT
+from pieces import SHIFTED, X_PAD
+
+# Breadth-first move generation: every distinct lock position a piece can
+# reach from where it is now by shifting, rotating and soft-dropping -
+# including tucks under overhangs and kicked rotations - each with the
+# shortest input path that gets it there.
+
+# Inputs making up a path
+LEFT = 'left'
+RIGHT = 'right'
+ROTATE = 'rotate'
+ROTATE_CCW = 'rotate_ccw'
+DOWN = 'down'  # One soft-drop step
+DROP = 'drop'  # Hard drop, always the last input
+
+# Kick tables: (dx, dy) offsets tried in order when rotating; the first one
+# that fits wins. The root Board rotates in place only; SHIFT_KICKS are the
+# sideways shifts tetris_o1_cplan.Board.rotate_piece tries.
+NO_KICKS = ((0, 0),)
+SHIFT_KICKS = ((0, 0), (-1, 0), (1, 0), (-2, 0), (2, 0))
+
+Placement = namedtuple('Placement', ['rotation', 'x', 'y', 'path'])
+
+# Piece origins range over x in [-X_PAD, GRID_WIDTH) and y in [-Y_PAD, GRID_HEIGHT)
+Y_PAD = 4
+ROW_SPAN = GRID_WIDTH + X_PAD
+ROTATION_SPAN = (GRID_HEIGHT + Y_PAD) * ROW_SPAN
+
+
+def board_rows(board):
+    # Occupancy bitmask per row (bit x = column x)
+    rows = getattr(board, 'rows', None)
+    if rows is not None:
+        return rows
+    return tuple(board.row_mask(y) for y in range(GRID_HEIGHT))
+
+
+def search(rows, shape_name, rotation, x, y, kicks=NO_KICKS, directions=(1,)):
+    # BFS over (rotation, x, y) from the given piece state. Returns one
+    # Placement per distinct set of locked cells; a placement's path is the
+    # shortest run of inputs from the start state, ending in DROP.
+    shifted = SHIFTED[shape_name]
+    rotations = len(shifted)
+
+    def fits(r, x, y):
+        if not -X_PAD <= x < GRID_WIDTH or y < -Y_PAD:
+            return False
+        masks = shifted[r][x + X_PAD]
+        if masks is None:
+            return False
+        for dy, mask in masks:
+            row = y + dy
+            if row >= GRID_HEIGHT:
+                return False
+            if row >= 0 and rows[row] & mask:
+                return False
+        return True
+
+    if not fits(rotation, x, y):
+        return []
+
+    turns = []
+    if rotations > 1:
+        for direction in directions:
+            turns.append((ROTATE if direction > 0 else ROTATE_CCW, direction))
+
+    visited = bytearray(rotations * ROTATION_SPAN)
+    parents = {}  # state -> (previous state, input)
+    start = (rotation, x, y)
+    visited[rotation * ROTATION_SPAN + (y + Y_PAD) * ROW_SPAN + x + X_PAD] = 1
+    queue = deque([start])
+    landings = {}  # locked cells -> (rotation, x, y, state the drop starts from)
+    floors = {}  # (r, x, y) -> lowest y reachable by dropping from there
+
+    while queue:
+        state = queue.popleft()
+        r, x, y = state
+
+        # Hard drop from here; the first (shortest) way to each landing wins
+        floor = floors.get(state)
+        if floor is None:
+            floor = y
+            while fits(r, x, floor + 1):
+                floor += 1
+            for between in range(y, floor + 1):
+                floors[(r, x, between)] = floor
+        cells = (r, x, floor) if rotations == 1 else tuple(
+            (floor + dy, mask) for dy, mask in shifted[r][x + X_PAD])
+        if cells not in landings:
+            landings[cells] = (r, x, floor, state)
+
+        moves = [(LEFT, r, x - 1, y), (RIGHT, r, x + 1, y)]
+        if floor > y:
+            moves.append((DOWN, r, x, y + 1))
+        for name, direction in turns:
+            nr = (r + direction) % rotations
+            for dx, dy in kicks:
+                if fits(nr, x + dx, y + dy):
+                    moves.append((name, nr, x + dx, y + dy))
+                    break
+        for name, nr, nx, ny in moves:
+            if name in (LEFT, RIGHT) and not fits(nr, nx, ny):
+                continue
+            index = nr * ROTATION_SPAN + (ny + Y_PAD) * ROW_SPAN + nx + X_PAD
+            if visited[index]:
+                continue
+            visited[index] = 1
+            nxt = (nr, nx, ny)
+            parents[nxt] = (state, name)
+            queue.append(nxt)
+
+    placements = []
+    for r, x, y, state in landings.values():
+        path = [DROP]
+        while state != start:
+            state, name = parents[state]
+            path.append(name)
+        path.reverse()
+        placements.append(Placement(r, x, y, tuple(path)))
+    return placements
+
+
+class MoveGenerator:
+    # search() with results memoized per (board hash, piece state), evicting
+    # the least recently used once capacity is reached; repeated calls for
+    # the same spawn (bot lookahead, hint redraws) are dictionary lookups
+    def __init__(self, kicks=NO_KICKS, directions=(1,), capacity=4096):
+        self.kicks = kicks
+        self.directions = directions
+        self.capacity = capacity
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def placements(self, board, piece=None):
+        piece = piece or board.current_piece
+        key = (board.hash, piece.shape_name, piece.rotation, piece.x, piece.y)
+        result = self.cache.get(key)
+        if result is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return result
+        self.misses += 1
+        result = search(board_rows(board), piece.shape_name, piece.rotation,
+                        piece.x, piece.y, self.kicks, self.directions)
+        self.cache[key] = result
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+        return result
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def rotate(board, direction=1, kicks=NO_KICKS):
+    # Rotate board.current_piece, trying the kick offsets in order
+    piece = board.current_piece
+    x, y, rotation = piece.x, piece.y, piece.rotation
+    piece.rotate(direction > 0)
+    for dx, dy in kicks:
+        piece.x, piece.y = x + dx, y + dy
+        if not board.check_collision(piece):
+            return True
+    piece.x, piece.y, piece.rotation = x, y, rotation
+    return False
+
+
+def apply_path(board, path, kicks=NO_KICKS):
+    # Play a path's inputs through the board's own move rules
+    for move in path:
+        if move == LEFT:
+            board.move_current_piece(-1, 0)
+        elif move == RIGHT:
+            board.move_current_piece(1, 0)
+        elif move == DOWN:
+            board.move_current_piece(0, 1)
+        elif move == DROP:
+            board.hard_drop()
+        else:
+            rotate(board, 1 if move == ROTATE else -1, kicks)
\ No newline at end of file
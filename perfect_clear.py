@@ -0,0 +1,314 @@
+import time
+from collections import namedtuple
+from constants import GRID_WIDTH, GRID_HEIGHT, SHAPES
+from pieces import compile_shape
+from movegen import board_rows
+
+# Perfect-clear search: find placements for a known piece queue that leave
+# the board empty. The bottom `height` rows are packed into one int, row r
+# (counted from the bottom) at bits r * GRID_WIDTH.., so a piece is a mask
+# and a line clear is a shift. Placements are hard-drop reachable: every
+# cell above the piece is empty and the piece rests on the stack or floor.
+
+# The root game only deals I, O and T; the other bag pieces in the same
+# 4x4 matrix form
+BAG_SHAPES = dict(SHAPES)
+BAG_SHAPES.update({
+    'S': [
+        [[0, 0, 0, 0],
+         [0, 1, 1, 0],
+         [1, 1, 0, 0],
+         [0, 0, 0, 0]],
+        [[0, 1, 0, 0],
+         [0, 1, 1, 0],
+         [0, 0, 1, 0],
+         [0, 0, 0, 0]]
+    ],
+    'Z': [
+        [[0, 0, 0, 0],
+         [1, 1, 0, 0],
+         [0, 1, 1, 0],
+         [0, 0, 0, 0]],
+        [[0, 0, 1, 0],
+         [0, 1, 1, 0],
+         [0, 1, 0, 0],
+         [0, 0, 0, 0]]
+    ],
+    'J': [
+        [[0, 0, 0, 0],
+         [1, 0, 0, 0],
+         [1, 1, 1, 0],
+         [0, 0, 0, 0]],
+        [[0, 1, 1, 0],
+         [0, 1, 0, 0],
+         [0, 1, 0, 0],
+         [0, 0, 0, 0]],
+        [[0, 0, 0, 0],
+         [1, 1, 1, 0],
+         [0, 0, 1, 0],
+         [0, 0, 0, 0]],
+        [[0, 1, 0, 0],
+         [0, 1, 0, 0],
+         [1, 1, 0, 0],
+         [0, 0, 0, 0]]
+    ],
+    'L': [
+        [[0, 0, 0, 0],
+         [0, 0, 1, 0],
+         [1, 1, 1, 0],
+         [0, 0, 0, 0]],
+        [[0, 1, 0, 0],
+         [0, 1, 0, 0],
+         [0, 1, 1, 0],
+         [0, 0, 0, 0]],
+        [[0, 0, 0, 0],
+         [1, 1, 1, 0],
+         [1, 0, 0, 0],
+         [0, 0, 0, 0]],
+        [[1, 1, 0, 0],
+         [0, 1, 0, 0],
+         [0, 1, 0, 0],
+         [0, 0, 0, 0]]
+    ]
+})
+
+MAX_HEIGHT = 6  # Tallest perfect clear searched for
+FLOOR = (1 << GRID_WIDTH) - 1
+EVEN_COLUMNS = sum(1 << (r * GRID_WIDTH + x)
+                   for r in range(MAX_HEIGHT) for x in range(0, GRID_WIDTH, 2))
+ODD_COLUMNS = EVEN_COLUMNS << 1
+CHECKERBOARD = sum(1 << (r * GRID_WIDTH + x)
+                   for r in range(MAX_HEIGHT) for x in range(GRID_WIDTH) if (r + x) % 2 == 0)
+COLUMNS = tuple(sum(1 << (r * GRID_WIDTH + x) for r in range(MAX_HEIGHT))
+                for x in range(GRID_WIDTH))
+
+# Most a piece can change (empty even-column cells - empty odd-column
+# cells): a vertical I covers one column parity only, T, J and L cover 3:1
+# in some orientations, O, S and Z always cover 2:2
+PARITY_SWING = {'I': 4, 'O': 0, 'T': 2, 'S': 0, 'Z': 0, 'J': 2, 'L': 2}
+
+# Checkerboard colouring: every piece covers 2:2 except T, which covers
+# 3:1 either way round
+CHECKERBOARD_SWING = {'I': 0, 'O': 0, 'T': 2, 'S': 0, 'Z': 0, 'J': 0, 'L': 0}
+
+TIME_LIMIT = 5.0  # Default seconds per solve(); None searches to the end
+
+# (shape, rotation, x, y, hold): the piece is played at (x, y) in board
+# coordinates of the board as it stands at that point (earlier line clears
+# applied); hold is True if the hold button is pressed first
+Step = namedtuple('Step', ['shape', 'rotation', 'x', 'y', 'hold'])
+
+
+class SolveTimeout(Exception):
+    pass
+
+
+def compile_placements(matrices):
+    # (mask, block, under, rotation, x, y) for every position of every
+    # rotation inside MAX_HEIGHT rows; block is the piece plus the cells
+    # above it, which a hard drop has to pass through, and under the cells
+    # right below it, which have to be filled for the piece to rest without
+    # overhang
+    placements = {}
+    for rotation, matrix in enumerate(matrices):
+        geometry = compile_shape(matrix)
+        left, top, right, bottom = geometry.bbox
+        for x in range(-left, GRID_WIDTH - right):
+            # r0 is the bottom-up row of the piece origin (dy = 0)
+            for r0 in range(bottom, MAX_HEIGHT + top):
+                mask = 0
+                for dx, dy in geometry.cells:
+                    mask |= 1 << ((r0 - dy) * GRID_WIDTH + x + dx)
+                shadow = 0
+                for dx, dy in geometry.cells:
+                    for r in range(r0 - dy + 1, MAX_HEIGHT):
+                        shadow |= 1 << (r * GRID_WIDTH + x + dx)
+                # Rotations with the same cells (O, I and S/Z flips) count once
+                under = (mask >> GRID_WIDTH) & ~mask
+                placements.setdefault(mask, (mask, shadow | mask, under, rotation, x,
+                                             GRID_HEIGHT - 1 - r0))
+    # Sorted by mask: low placements, the ones that can complete rows, come
+    # first, and everything past the first mask above the field is too tall
+    return tuple(placements[mask] for mask in sorted(placements))
+
+
+PLACEMENTS = {name: compile_placements(matrices) for name, matrices in BAG_SHAPES.items()}
+
+
+def pack(board, height):
+    # Bottom `height` rows of a Board as one int, or None if the stack is taller
+    rows = board_rows(board)
+    if any(rows[:GRID_HEIGHT - height]):
+        return None
+    field = 0
+    for r in range(height):
+        field |= rows[GRID_HEIGHT - 1 - r] << r * GRID_WIDTH
+    return field
+
+
+def clear_full_rows(field, height):
+    # Drop full rows; returns (field, rows left)
+    r = 0
+    while r < height:
+        if (field >> r * GRID_WIDTH) & FLOOR == FLOOR:
+            below = field & ((1 << r * GRID_WIDTH) - 1)
+            field = below | (field >> (r + 1) * GRID_WIDTH) << r * GRID_WIDTH
+            height -= 1
+        else:
+            r += 1
+    return field, height
+
+
+def holes(field):
+    # Empty cells with a filled cell somewhere above them: smear the field
+    # down a row at a time and count the empty cells it reaches
+    cover = 0
+    above = field >> GRID_WIDTH
+    while above:
+        cover |= above
+        above >>= GRID_WIDTH
+    return (cover & ~field).bit_count()
+
+
+class PerfectClearSolver:
+    # Two passes: the first skips placements that leave more covered holes
+    # than the board started with, which prunes hard and finds most setups
+    # quickly; the second allows one more hole at a time, for setups that
+    # rely on clearing the rows over a hole. The failed set is keyed on the
+    # field, the rest of the queue and the hole limit, so it stays valid
+    # across solve() calls: a practice mode re-solving after every
+    # placement mostly hits it.
+    def __init__(self, hold=True, capacity=1 << 20):
+        self.hold = hold
+        self.capacity = capacity
+        self.failed = set()  # (field, height, remaining queue, held, hole limit)
+        self.queue = ()
+        self.hole_limit = 0
+        self.deadline = None
+        self.timed_out = False
+        self.nodes = 0
+
+    def solve(self, board, queue, height=4, held=None, time_limit=TIME_LIMIT):
+        # Steps that clear the bottom `height` rows, or None if there are
+        # none. `queue` lists shape names, current piece first; `held` is the
+        # piece in hold. Raises SolveTimeout if time_limit seconds pass
+        # first: most 4-line queues take well under a second, a few take
+        # tens, and time_limit=None searches to the end.
+        if height > MAX_HEIGHT:
+            raise ValueError(f"height must be at most {MAX_HEIGHT}")
+        field = pack(board, height)
+        if field is None or (height * GRID_WIDTH - field.bit_count()) % 4:
+            return None
+        if len(self.failed) > self.capacity:
+            self.failed.clear()
+        self.queue = tuple(queue)
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.timed_out = False
+        self.nodes = 0
+        start_holes = holes(field)
+        for new_holes in (0, 1):
+            self.hole_limit = start_holes + new_holes
+            steps = []
+            if self.search(field, height, 0, held, steps):
+                return steps
+            if self.timed_out:
+                raise SolveTimeout
+        return None
+
+    def options(self, index, held):
+        # (shape, next index, next held, hold pressed) for the next placement
+        queue = self.queue
+        if index >= len(queue):
+            return []
+        current = queue[index]
+        options = [(current, index + 1, held, False)]
+        if self.hold:
+            if held is None:
+                if index + 1 < len(queue) and queue[index + 1] != current:
+                    options.append((queue[index + 1], index + 2, current, True))
+            elif held != current:
+                options.append((held, index + 1, current, True))
+        return options
+
+    def dead_end(self, field, height, index, held):
+        # Cheap checks that no way of finishing exists
+        # Cell count: each piece fills 4 of the empty cells, so that many
+        # pieces must still be on hand
+        size = height * GRID_WIDTH
+        need = (size - field.bit_count()) // 4
+        upcoming = list(self.queue[index:index + need + self.hold])
+        if held is not None:
+            upcoming.append(held)
+        if len(upcoming) < need:
+            return True
+
+        # Column parity: the imbalance between empty cells in even and odd
+        # columns has to be made up by the pieces that can still swing it
+        empty = ~field & ((1 << size) - 1)
+        imbalance = abs((empty & EVEN_COLUMNS).bit_count() - (empty & ODD_COLUMNS).bit_count())
+        if imbalance > sum(sorted((PARITY_SWING[s] for s in upcoming), reverse=True)[:need]):
+            return True
+
+        # Checkerboard parity, once the empty cells fit in two adjacent rows.
+        # Before that a clear between empty cells would shift the ones above
+        # it by a row and swap their colours; with two rows a clear only
+        # ever leaves one row, so the imbalance keeps its size and only T
+        # pieces can make it up.
+        lowest = (empty & -empty).bit_length() - 1
+        if empty >> (lowest // GRID_WIDTH + 2) * GRID_WIDTH == 0:
+            imbalance = abs((empty & CHECKERBOARD).bit_count() * 2 - empty.bit_count())
+            if imbalance > sum(sorted((CHECKERBOARD_SWING[s] for s in upcoming),
+                                      reverse=True)[:need]):
+                return True
+
+        # Regions: a full column splits the field for good (clears only ever
+        # remove whole rows), so the empty cells between full columns must
+        # come in fours as well
+        full = FLOOR
+        for r in range(height):
+            full &= field >> r * GRID_WIDTH
+        region = 0
+        for x in range(GRID_WIDTH):
+            if full >> x & 1:
+                if region % 4:
+                    return True
+                region = 0
+            else:
+                region += height - (field & COLUMNS[x]).bit_count()
+        return region % 4 != 0
+
+    def search(self, field, height, index, held, steps):
+        if not height:
+            return True
+        key = (field, height, self.queue[index:], held, self.hole_limit)
+        if key in self.failed:
+            return False
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes & 1023:
+            self.timed_out = time.perf_counter() > self.deadline
+        if self.timed_out:
+            return False
+        if self.dead_end(field, height, index, held):
+            self.failed.add(key)
+            return False
+
+        limit = 1 << height * GRID_WIDTH
+        for shape, next_index, next_held, pressed in self.options(index, held):
+            for mask, block, under, rotation, x, y in PLACEMENTS[shape]:
+                if mask >= limit:
+                    break
+                if block & field or not (mask & FLOOR or under & field):
+                    continue  # Blocked, out of reach, or still falling
+                next_field, next_height = clear_full_rows(field | mask, height)
+                if under & ~field:
+                    # Overhang: counts unless the rows over the hole just cleared
+                    if holes(next_field) > self.hole_limit:
+                        continue
+                steps.append(Step(shape, rotation, x, y, pressed))
+                if self.search(next_field, next_height, next_index, next_held, steps):
+                    return True
+                steps.pop()
+                if self.timed_out:
+                    return False
+        self.failed.add(key)
+        return False
\ No newline at end of file
@@ -1,5 +1,56 @@
 import random
-from constants import SHAPES, COLORS
+from collections import namedtuple
+from constants import GRID_WIDTH, SHAPES, COLORS, COLOR_INDEX
+
+# Geometry of one (shape, rotation), relative to the piece's (x, y):
+#   cells     - (dx, dy) offsets of the filled cells
+#   row_masks - (dy, mask) for every non-empty row, bit j = column offset j
+#   bbox      - (min_dx, min_dy, max_dx, max_dy)
+#   bottom    - (dx, lowest dy) for every column the piece occupies
+Geometry = namedtuple('Geometry', ['cells', 'row_masks', 'bbox', 'bottom'])
+
+
+def compile_shape(matrix):
+    cells = tuple((j, i) for i in range(4) for j in range(4) if matrix[i][j])
+    row_masks = []
+    for i in range(4):
+        mask = 0
+        for j in range(4):
+            if matrix[i][j]:
+                mask |= 1 << j
+        if mask:
+            row_masks.append((i, mask))
+    xs = [dx for dx, _ in cells]
+    ys = [dy for _, dy in cells]
+    lowest = {}
+    for dx, dy in cells:
+        lowest[dx] = max(lowest.get(dx, dy), dy)
+    return Geometry(cells, tuple(row_masks),
+                    (min(xs), min(ys), max(xs), max(ys)),
+                    tuple(sorted(lowest.items())))
+
+
+# Compiled once at import: GEOMETRY[shape_name][rotation]
+GEOMETRY = {name: tuple(compile_shape(matrix) for matrix in rotations)
+            for name, rotations in SHAPES.items()}
+
+X_PAD = 4  # Piece x positions covered by SHIFTED start this far left of the board
+
+
+def shift_masks(geometry, x):
+    # Row masks moved to column x, or None if the piece would leave the board
+    left, _, right, _ = geometry.bbox
+    if x + left < 0 or x + right >= GRID_WIDTH:
+        return None
+    return tuple((dy, (mask << x) if x >= 0 else (mask >> -x))
+                 for dy, mask in geometry.row_masks)
+
+
+# SHIFTED[shape][rotation][x + X_PAD] for x in [-X_PAD, GRID_WIDTH)
+SHIFTED = {name: tuple(tuple(shift_masks(geometry, x) for x in range(-X_PAD, GRID_WIDTH))
+                       for geometry in rotations)
+           for name, rotations in GEOMETRY.items()}
+
 
 class Piece:
     def __init__(self, shape_name=None):
@@ -7,19 +58,32 @@ class Piece:
             shape_name = random.choice(list(SHAPES.keys()))
         self.shape_name = shape_name
         self.shape = SHAPES[shape_name]
+        self.geometry = GEOMETRY[shape_name]
         self.color = COLORS[shape_name]
+        self.color_index = COLOR_INDEX[shape_name]
         self.rotation = 0
         self.x = 3  # Starting x position (center of grid)
         self.y = 0  # Starting y position (top of grid)
 
+    @property
+    def cells(self):
+        return self.geometry[self.rotation].cells
+
+    @property
+    def row_masks(self):
+        return self.geometry[self.rotation].row_masks
+
+    @property
+    def bbox(self):
+        return self.geometry[self.rotation].bbox
+
+    @property
+    def bottom(self):
+        return self.geometry[self.rotation].bottom
+
     def get_positions(self):
-        positions = []
-        shape_matrix = self.shape[self.rotation]
-        for i in range(4):
-            for j in range(4):
-                if shape_matrix[i][j]:
-                    positions.append((self.x + j, self.y + i))
-        return positions
+        x, y = self.x, self.y
+        return [(x + dx, y + dy) for dx, dy in self.geometry[self.rotation].cells]
 
     def rotate(self, clockwise=True):
         if clockwise:
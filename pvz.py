@@ -3,6 +3,8 @@ import sys
 import random
 import time
 import math
+from text_cache import TextCache
+from frame_profiler import profiler_from_env
 
 # ---------------------------
 # CONSTANTS & CONFIG
@@ -15,6 +17,9 @@ SCREEN_WIDTH = GRID_COLS * CELL_SIZE
 SCREEN_HEIGHT = GRID_ROWS * CELL_SIZE + UI_HEIGHT
 FPS = 30
 
+# Rendered HUD and overlay text, shared across restarts
+TEXT_CACHE = TextCache()
+
 # Game States
 STATE_MENU = "MENU"
 STATE_PLAYING = "PLAYING"
@@ -534,7 +539,7 @@ class GameState:
         elif self.state == STATE_PAUSED:
             # Draw the playing field with a pause overlay
             self.draw_playfield(surface, font)
-            paused_text = font.render("PAUSED - Press P to Resume", True, (255,0,0))
+            paused_text = TEXT_CACHE.render(font, "PAUSED - Press P to Resume", (255,0,0))
             rect = paused_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
             surface.blit(paused_text, rect)
             return
@@ -575,13 +580,13 @@ class GameState:
 
         # UI panel
         pygame.draw.rect(surface, COLOR_UI_BG, (0,0,SCREEN_WIDTH,UI_HEIGHT))
-        sun_text = font.render(f"Sun: {self.sun_count}", True, COLOR_TEXT)
+        sun_text = TEXT_CACHE.label("sun", font, f"Sun: {self.sun_count}", COLOR_TEXT)
         surface.blit(sun_text, (10,10))
 
-        score_text = font.render(f"Score: {self.score}", True, COLOR_TEXT)
+        score_text = TEXT_CACHE.label("score", font, f"Score: {self.score}", COLOR_TEXT)
         surface.blit(score_text, (10,40))
 
-        wave_text = font.render(f"Wave: {self.current_wave}/{TOTAL_WAVES}", True, COLOR_TEXT)
+        wave_text = TEXT_CACHE.label("wave", font, f"Wave: {self.current_wave}/{TOTAL_WAVES}", COLOR_TEXT)
         surface.blit(wave_text, (10,70))
 
         # Plant selection
@@ -603,33 +608,33 @@ class GameState:
                 cost = CHERRYBOMB_COST
             else:
                 cost = ICEPEA_COST
-            cost_text = font.render(str(cost), True, (0,0,0))
+            cost_text = TEXT_CACHE.render(font, str(cost), (0,0,0))
             surface.blit(cost_text, (x_offset+20, 75))
             x_offset += 80
 
     def draw_menu(self, surface, font):
         surface.fill(COLOR_MENU_BG)
-        title_text = font.render("Plants vs Zombies (Advanced)", True, (255,255,0))
+        title_text = TEXT_CACHE.render(font, "Plants vs Zombies (Advanced)", (255,255,0))
         rect = title_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
         surface.blit(title_text, rect)
 
-        instruct_text = font.render("Press SPACE to Start", True, COLOR_TEXT)
+        instruct_text = TEXT_CACHE.render(font, "Press SPACE to Start", COLOR_TEXT)
         rect = instruct_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
         surface.blit(instruct_text, rect)
 
-        quit_text = font.render("Press ESC to Quit", True, COLOR_TEXT)
+        quit_text = TEXT_CACHE.render(font, "Press ESC to Quit", COLOR_TEXT)
         rect = quit_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
         surface.blit(quit_text, rect)
 
     def draw_gameover(self, surface, font):
         self.draw_playfield(surface, font)
-        over_text = font.render("GAME OVER - Press R to Restart or ESC to Quit", True, (255,0,0))
+        over_text = TEXT_CACHE.render(font, "GAME OVER - Press R to Restart or ESC to Quit", (255,0,0))
         rect = over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
         surface.blit(over_text, rect)
 
     def draw_win(self, surface, font):
         self.draw_playfield(surface, font)
-        win_text = font.render("YOU WIN! Press R to Restart or ESC to Quit", True, (0,255,0))
+        win_text = TEXT_CACHE.render(font, "YOU WIN! Press R to Restart or ESC to Quit", (0,255,0))
         rect = win_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
         surface.blit(win_text, rect)
 
@@ -654,7 +659,8 @@ class GameState:
 # ---------------------------
 # MAIN GAME LOOP
 # ---------------------------
-def run_game():
+def run_game(profiler=None):
+    # profiler: optional frame_profiler.FrameProfiler; F3 toggles its overlay
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Plants vs Zombies (Even More Advanced)")
@@ -666,8 +672,12 @@ def run_game():
 
     while running:
         dt = clock.tick(FPS) / 1000.0
+        if profiler:
+            profiler.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if profiler:
+                    profiler.close()
                 pygame.quit()
                 sys.exit()
 
@@ -675,6 +685,8 @@ def run_game():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
+                if event.key == pygame.K_F3 and profiler:
+                    profiler.toggle_overlay()
                 if gamestate.state == STATE_MENU:
                     if event.key == pygame.K_SPACE:
                         gamestate.start_game()
@@ -702,13 +714,24 @@ def run_game():
                     # Check for falling suns anywhere
                     gamestate.collect_sun((x,y))
 
+        if profiler:
+            profiler.mark('input')
+
         if gamestate.state == STATE_PLAYING:
             gamestate.update(dt)
+        if profiler:
+            profiler.mark('update')
 
         gamestate.draw(screen, font)
+        if profiler and profiler.overlay:
+            profiler.draw_overlay(screen, font, (10, SCREEN_HEIGHT - 150))
         pygame.display.flip()
+        if profiler:
+            profiler.mark('draw')
 
+    if profiler:
+        profiler.close()
     pygame.quit()
 
 if __name__ == "__main__":
-    run_game()
\ No newline at end of file
+    run_game(profiler_from_env())
\ No newline at end of file
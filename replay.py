@@ -0,0 +1,154 @@
+import struct
+import sys
+import time
+from constants import LOGIC_RATE
+from board import Board, SEED_MASK
+from undo import UndoHistory
+
+# Actions recorded from Game.handle_input
+LEFT = 0
+RIGHT = 1
+ROTATE = 2
+HARD_DROP = 3
+SOFT_DROP_ON = 4
+SOFT_DROP_OFF = 5
+UNDO = 6
+
+ACTION_BITS = 3
+
+# File layout: header, then one varint per action holding
+# (ticks since the previous action << ACTION_BITS) | action
+MAGIC = b'TRPL'
+VERSION = 1
+HEADER = struct.Struct('<4sBHQII')  # magic, version, logic rate, seed, end tick, count
+
+
+def apply_action(board, action, history=None):
+    if action == LEFT:
+        board.move_current_piece(-1, 0)
+    elif action == RIGHT:
+        board.move_current_piece(1, 0)
+    elif action == ROTATE:
+        board.rotate_current_piece()
+    elif action == HARD_DROP:
+        board.hard_drop()
+    elif action == UNDO and history is not None:
+        history.undo()
+    else:
+        raise ValueError(f"Unknown replay action {action}")
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class ReplayRecorder:
+    def __init__(self, seed, logic_rate=LOGIC_RATE):
+        # Board seeds are normalised to 64 bits; checked here so a bad seed
+        # fails when recording starts, not when the replay is saved
+        if not 0 <= seed <= SEED_MASK:
+            raise ValueError(f"replay seed must fit in 64 unsigned bits, got {seed}")
+        self.seed = seed
+        self.logic_rate = logic_rate
+        self.actions = []  # (tick, action)
+
+    def record(self, tick, action):
+        self.actions.append((tick, action))
+
+    def encode(self, end_tick):
+        body = bytearray()
+        last_tick = 0
+        for tick, action in self.actions:
+            write_varint(body, ((tick - last_tick) << ACTION_BITS) | action)
+            last_tick = tick
+        header = HEADER.pack(MAGIC, VERSION, self.logic_rate, self.seed,
+                             end_tick, len(self.actions))
+        return header + bytes(body)
+
+    def save(self, path, end_tick):
+        with open(path, 'wb') as f:
+            f.write(self.encode(end_tick))
+
+
+class Replay:
+    def __init__(self, seed, logic_rate, end_tick, actions):
+        self.seed = seed
+        self.logic_rate = logic_rate
+        self.end_tick = end_tick
+        self.actions = actions
+
+    @classmethod
+    def decode(cls, data):
+        magic, version, logic_rate, seed, end_tick, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a Tetris replay file")
+        actions = []
+        pos = HEADER.size
+        tick = 0
+        for _ in range(count):
+            value, pos = read_varint(data, pos)
+            tick += value >> ACTION_BITS
+            actions.append((tick, value & ((1 << ACTION_BITS) - 1)))
+        return cls(seed, logic_rate, end_tick, actions)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.decode(f.read())
+
+    def play(self, board_class=Board):
+        # Re-simulate the recorded game tick by tick with no rendering, in
+        # the same order Game.run applies input and gravity
+        board = board_class(self.seed)
+        board.spawn_piece()
+        history = UndoHistory(board)
+        history.track()
+        tick_ms = 1000 / self.logic_rate
+        soft_drop = False
+        actions = self.actions
+        index = 0
+        for tick in range(self.end_tick + 1):
+            while index < len(actions) and actions[index][0] == tick:
+                action = actions[index][1]
+                if action == SOFT_DROP_ON or action == SOFT_DROP_OFF:
+                    soft_drop = action == SOFT_DROP_ON
+                else:
+                    apply_action(board, action, history)
+                    history.track()
+                index += 1
+            if tick == self.end_tick:
+                break
+            if not board.game_over:
+                board.apply_gravity(tick_ms, soft_drop)
+                history.track()
+        return board
+
+
+def play_replay(path, board_class=Board):
+    return Replay.load(path).play(board_class)
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        board = replay.play()
+        elapsed = time.perf_counter() - start
+        print(f"{path}: score {board.score}, lines {board.lines_cleared}, "
+              f"{replay.end_tick} ticks in {elapsed:.3f}s "
+              f"({replay.end_tick / max(elapsed, 1e-9):.0f} ticks/s)")
\ No newline at end of file
@@ -1,6 +1,7 @@
 import pygame
 import random
 import sys
+from text_cache import TextCache
 
 pygame.init()
 
@@ -13,6 +14,7 @@ GAME_AREA_TOP = 40  # Reserve space at top for equation
 GAME_AREA_HEIGHT = HEIGHT - GAME_AREA_TOP
 FONT = pygame.font.SysFont("Arial", 20)  # Main font
 SMALL_FONT = pygame.font.SysFont("Arial", 14)  # Smaller font for answer blocks
+TEXT_CACHE = TextCache()  # Rendered text surfaces, reused across frames
 
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 clock = pygame.time.Clock()
@@ -57,7 +59,7 @@ def generate_problem(snake_length):
 # Render text
 def render_text(text, color=(255,255,255), small=False):
     font = SMALL_FONT if small else FONT
-    return font.render(text, True, color)
+    return TEXT_CACHE.render(font, text, color)
 
 def draw_snake(snake, a, op, b):
     # Draw snake segments as simple rectangles without text
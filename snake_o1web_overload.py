@@ -2,6 +2,7 @@ import pygame
 import random
 import sys
 import os
+from text_cache import TextCache
 
 pygame.init()
 
@@ -13,6 +14,7 @@ FPS = 10
 GAME_AREA_TOP = 40
 FONT = pygame.font.SysFont("Arial", 20)
 SMALL_FONT = pygame.font.SysFont("Arial", 14)
+TEXT_CACHE = TextCache()  # Rendered text surfaces, reused across frames
 
 HIGH_SCORE_FILE = "highscore.txt"
 
@@ -67,7 +69,7 @@ def generate_problem(snake_length):
 
 def render_text(text, color=(255,255,255), small=False):
     font = SMALL_FONT if small else FONT
-    return font.render(text, True, color)
+    return TEXT_CACHE.render(font, text, color)
 
 def draw_snake(snake):
     for segment in snake:
@@ -4,6 +4,7 @@ import sys
 import os
 import numpy as np
 import math
+from text_cache import TextCache
 
 pygame.init()
 pygame.mixer.init()
@@ -17,6 +18,7 @@ GAME_AREA_TOP = 40
 FONT = pygame.font.SysFont("Arial", 20)
 SMALL_FONT = pygame.font.SysFont("Arial", 14)
 LARGE_FONT = pygame.font.SysFont("Arial", 36)
+TEXT_CACHE = TextCache()  # Rendered text surfaces, reused across frames
 
 # Christmas colors and theme
 WHITE = (255, 255, 255)
@@ -181,7 +183,7 @@ paused = False
 
 def render_text(text, color=(255,255,255), small=False):
     font = SMALL_FONT if small else FONT
-    return font.render(text, True, color)
+    return TEXT_CACHE.render(font, text, color)
 
 def draw_snake(snake):
     # Head (Santa's sleigh)
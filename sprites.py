@@ -0,0 +1,54 @@
+import pygame
+from constants import BLACK, PALETTE
+
+BLOCK_STYLES = ('flat', 'bevel', 'highlight', 'ghost')
+
+
+def shade(color, factor):
+    if factor >= 1:
+        return tuple(min(255, int(c + (255 - c) * (factor - 1))) for c in color)
+    return tuple(int(c * factor) for c in color)
+
+
+def render_block(color, size, style='flat'):
+    if style not in BLOCK_STYLES:
+        raise ValueError(f"unknown block style {style!r}, expected one of {BLOCK_STYLES}")
+    surface = pygame.Surface((size, size))
+    surface.fill(BLACK)
+    inner = size - 1  # One pixel gap between neighbouring blocks
+    if style == 'highlight':
+        color = shade(color, 1.5)
+    if style == 'ghost':
+        # Landing preview: outline only
+        pygame.draw.rect(surface, shade(color, 0.7), (0, 0, inner, inner), max(1, inner // 15))
+    else:
+        pygame.draw.rect(surface, color, (0, 0, inner, inner))
+
+    if style in ('bevel', 'highlight') and inner >= 4:
+        edge = max(1, inner // 8)
+        light = shade(color, 1.6)
+        dark = shade(color, 0.55)
+        pygame.draw.rect(surface, light, (0, 0, inner, edge))
+        pygame.draw.rect(surface, light, (0, 0, edge, inner))
+        pygame.draw.rect(surface, dark, (0, inner - edge, inner, edge))
+        pygame.draw.rect(surface, dark, (inner - edge, 0, edge, inner))
+
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+
+class SpriteCache:
+    def __init__(self):
+        self.sprites = {}
+
+    def get(self, index, size, style='flat'):
+        key = (index, size, style)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = render_block(PALETTE[index], size, style)
+            self.sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
\ No newline at end of file
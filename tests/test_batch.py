@@ -0,0 +1,23 @@
+import unittest
+from batch import MAX_PIECES, play_game, run_batch
+
+
+class TestAiPolicy(unittest.TestCase):
+    def test_game_stops_at_piece_cap(self):
+        result = play_game(0, 'ai', max_pieces=50)
+        self.assertLessEqual(result['pieces'], 50)
+
+    def test_default_cap_is_finite(self):
+        result = play_game(1, 'ai')
+        self.assertLessEqual(result['pieces'], MAX_PIECES)
+
+    def test_run_batch(self):
+        results = list(run_batch(4, policy='ai', workers=2, max_pieces=40, chunk_size=2))
+        self.assertEqual(sorted(result['seed'] for result in results), [0, 1, 2, 3])
+        for result in results:
+            self.assertLessEqual(result['pieces'], 40)
+            self.assertGreater(result['lines'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
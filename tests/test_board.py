@@ -0,0 +1,128 @@
+import random
+import unittest
+from constants import GRID_WIDTH, GRID_HEIGHT, EMPTY, INSTANT_GRAVITY_LEVEL, LOCK_DELAY
+from board import Board
+from bitboard import BitBoard
+from batch import place, random_policy
+from ai import PlacementAI
+from undo import UndoHistory
+from zobrist import grid_hash
+
+
+def recount(grid):
+    # row_fill, column_fill and heights from scratch
+    row_fill = tuple(sum(cell != EMPTY for cell in row) for row in grid)
+    column_fill = tuple(sum(grid[y][x] != EMPTY for y in range(GRID_HEIGHT))
+                        for x in range(GRID_WIDTH))
+    heights = tuple(next((GRID_HEIGHT - y for y in range(GRID_HEIGHT) if grid[y][x] != EMPTY), 0)
+                    for x in range(GRID_WIDTH))
+    return row_fill, column_fill, heights
+
+
+class TestStats(unittest.TestCase):
+    def check(self, board):
+        self.assertEqual((tuple(board.row_fill), tuple(board.column_fill), tuple(board.heights)),
+                         recount(board.grid))
+
+    def test_match_recount(self):
+        # Through locks, line clears and restores of earlier snapshots; the
+        # AI clears lines, random play leaves overhangs
+        ai = PlacementAI()
+        for board_class in (Board, BitBoard):
+            lines = 0
+            for seed in range(6):
+                policy = ai if seed % 2 else random_policy
+                board = board_class(seed)
+                board.spawn_piece()
+                rng = random.Random(seed)
+                snapshots = []
+                while not board.game_over and len(snapshots) < 80:
+                    place(board, *policy(board, rng))
+                    self.check(board)
+                    snapshots.append(board.snapshot())
+                lines += board.lines_cleared
+                for snapshot in snapshots[::3]:
+                    board.restore(snapshot)
+                    self.check(board)
+                    if not board.game_over:
+                        place(board, *random_policy(board, rng))
+                        self.check(board)
+            self.assertGreater(lines, 0)
+
+
+class TestHash(unittest.TestCase):
+    def check(self, board):
+        self.assertEqual(board.hash, grid_hash([board.row_mask(y) for y in range(GRID_HEIGHT)]))
+
+    def test_matches_full_hash(self):
+        # The incremental hash after locks, clears, undos and restores
+        ai = PlacementAI()
+        for board_class in (Board, BitBoard):
+            for seed in range(4):
+                policy = ai if seed % 2 else random_policy
+                board = board_class(seed)
+                board.spawn_piece()
+                history = UndoHistory(board)
+                history.track()
+                rng = random.Random(seed)
+                snapshots = []
+                for turn in range(60):
+                    if board.game_over:
+                        break
+                    place(board, *policy(board, rng))
+                    history.track()
+                    self.check(board)
+                    if turn % 5 == 4:
+                        history.undo()
+                        self.check(board)
+                    snapshots.append(board.snapshot())
+                for snapshot in snapshots[::4]:
+                    board.restore(snapshot)
+                    self.check(board)
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_restore_on_another_board(self):
+        # A fresh board with the same seed hasn't drawn the snapshot's
+        # pieces yet, and must replay the same ones after restoring
+        for board_class in (Board, BitBoard):
+            board = board_class(7)
+            board.spawn_piece()
+            for x in range(12):
+                place(board, 0, x % 7)
+            snapshot = board.snapshot()
+            place(board, 1, 3)
+            upcoming = [board.current_piece.shape_name, board.next_piece.shape_name]
+
+            other = board_class(7)
+            other.restore(snapshot)
+            self.assertEqual(other.grid, snapshot.grid)
+            place(other, 1, 3)
+            self.assertEqual([other.current_piece.shape_name, other.next_piece.shape_name],
+                             upcoming)
+            self.assertEqual(other.hash, board.hash)
+
+
+class TestGravity(unittest.TestCase):
+    def test_20g_locks_after_lock_delay(self):
+        for board_class in (Board, BitBoard):
+            board = board_class(3)
+            board.level = INSTANT_GRAVITY_LEVEL
+            board.spawn_piece()
+            tick = 1000 / 60
+            board.apply_gravity(tick)
+            # On the floor at once, but not locked yet
+            piece = board.current_piece
+            self.assertEqual(board.drop_distance(piece), 0)
+            self.assertEqual(board.stream_index, 2)
+            for _ in range(int(LOCK_DELAY / tick) - 1):
+                board.apply_gravity(tick)
+            self.assertIs(board.current_piece, piece)
+            board.apply_gravity(tick)
+            self.assertIsNot(board.current_piece, piece)
+            self.assertEqual(board.stream_index, 3)
+            self.assertEqual(sum(board.row_fill), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import unittest
+from board import Board
+from batch import place, random_policy
+from ai import PlacementAI
+from movegen import NO_KICKS, SHIFT_KICKS, DROP, MoveGenerator, apply_path
+
+
+def positions(count=12, seed=3):
+    # Snapshots of ragged stacks from random play, overhangs included
+    board = Board(seed)
+    board.spawn_piece()
+    rng = random.Random(seed)
+    snapshots = []
+    while len(snapshots) < count:
+        if board.game_over:
+            board = Board(board.seed + 1)
+            board.spawn_piece()
+        place(board, *random_policy(board, rng))
+        if not board.game_over:
+            snapshots.append(board.snapshot())
+    return board, snapshots
+
+
+class TestPaths(unittest.TestCase):
+    def check_paths(self, kicks, directions):
+        board, snapshots = positions()
+        generator = MoveGenerator(kicks, directions)
+        for snapshot in snapshots:
+            board.restore(snapshot)
+            placements = generator.placements(board)
+            self.assertTrue(placements)
+            for placement in placements:
+                board.restore(snapshot)
+                self.assertEqual(placement.path[-1], DROP)
+                apply_path(board, placement.path[:-1], kicks)
+                piece = board.current_piece
+                self.assertEqual((piece.rotation, piece.x, piece.y + board.drop_distance(piece)),
+                                 (placement.rotation, placement.x, placement.y))
+                apply_path(board, placement.path[-1:], kicks)
+
+    def test_no_kicks(self):
+        self.check_paths(NO_KICKS, (1,))
+
+    def test_shift_kicks(self):
+        self.check_paths(SHIFT_KICKS, (1, -1))
+
+
+class TestChoosePath(unittest.TestCase):
+    def test_default_generator(self):
+        board, snapshots = positions(count=1)
+        board.restore(snapshots[0])
+        placement = PlacementAI().choose_path(board)
+        self.assertIsNotNone(placement)
+        pieces = board.stream_index
+        apply_path(board, placement.path)
+        self.assertEqual(board.stream_index, pieces + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
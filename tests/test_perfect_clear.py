@@ -0,0 +1,71 @@
+import unittest
+from constants import GRID_WIDTH, GRID_HEIGHT
+from board import Board
+from pieces import compile_shape
+from perfect_clear import BAG_SHAPES, PerfectClearSolver, SolveTimeout
+
+# A queue whose 4-line perfect clear takes the solver well over a second
+HARD_QUEUE = 'TSOLIJZJSTZ'
+
+
+def play_steps(filled, steps, queue, held=None):
+    # Plays the solver's steps on a set of filled (x, y) cells, checking
+    # each one against the queue, hold and hard-drop rules; returns the
+    # cells left afterwards
+    queue = list(queue)
+    for step in steps:
+        if step.hold:
+            if held is None:
+                held, queue = queue[0], queue[1:]
+            else:
+                held, queue[0] = queue[0], held
+        assert queue[0] == step.shape, (step, queue)
+        queue = queue[1:]
+        cells = {(step.x + dx, step.y + dy)
+                 for dx, dy in compile_shape(BAG_SHAPES[step.shape][step.rotation]).cells}
+        for x, y in cells:
+            assert 0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT, step
+            assert (x, y) not in filled, step
+            # Nothing above the piece, so a hard drop gets it there
+            assert not any((x, above) in filled for above in range(y)), step
+        assert any(y + 1 == GRID_HEIGHT or (x, y + 1) in filled for x, y in cells), step
+        filled |= cells
+        full = [y for y in range(GRID_HEIGHT)
+                if all((x, y) in filled for x in range(GRID_WIDTH))]
+        for row in full:
+            filled = {(x, y + 1) if y < row else (x, y) for x, y in filled if y != row}
+    return filled
+
+
+class TestSolve(unittest.TestCase):
+    def check(self, cells, queue, height, held=None):
+        board = Board(0)
+        if cells:
+            board.place_cells(cells, 1)
+        steps = PerfectClearSolver().solve(board, queue, height, held, time_limit=None)
+        self.assertIsNotNone(steps)
+        self.assertEqual(play_steps(set(cells), steps, queue, held), set())
+
+    def test_empty_board(self):
+        self.check([], 'LZJTISOTOJI', 4)
+
+    def test_two_lines_on_a_stack(self):
+        # Columns 0-3 filled two high; three O pieces fill the rest
+        cells = [(x, y) for x in range(4) for y in (GRID_HEIGHT - 2, GRID_HEIGHT - 1)]
+        self.check(cells, 'OOOLI', 2)
+
+    def test_held_piece(self):
+        self.check([], 'OIOOO', 2, held='I')
+
+    def test_no_solution(self):
+        self.assertIsNone(PerfectClearSolver().solve(Board(0), 'I', 4, time_limit=None))
+
+    def test_timeout(self):
+        solver = PerfectClearSolver()
+        with self.assertRaises(SolveTimeout):
+            solver.solve(Board(0), HARD_QUEUE, 4, time_limit=0)
+        self.assertTrue(solver.timed_out)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import random
+import unittest
+from board import Board, SEED_MASK
+from bitboard import BitBoard
+from undo import UndoHistory
+from replay import (LEFT, RIGHT, ROTATE, HARD_DROP, SOFT_DROP_ON, SOFT_DROP_OFF, UNDO,
+                    Replay, ReplayRecorder, apply_action)
+
+TICK_MS = 1000 / 60
+
+
+def record_game(seed, ticks, rng):
+    # Random input played and recorded the way Game.run does it: the
+    # tick's actions first, then gravity; undo as in practice mode
+    board = Board(seed)
+    board.spawn_piece()
+    history = UndoHistory(board)
+    history.track()
+    recorder = ReplayRecorder(board.seed, 60)
+    soft_drop = False
+    end_tick = ticks
+    for tick in range(ticks):
+        if board.game_over:
+            end_tick = tick
+            break
+        for _ in range(rng.random() < 0.2):
+            action = rng.choice((LEFT, LEFT, RIGHT, RIGHT, ROTATE, ROTATE, SOFT_DROP_ON,
+                                 SOFT_DROP_OFF, SOFT_DROP_OFF, HARD_DROP, UNDO))
+            recorder.record(tick, action)
+            if action == SOFT_DROP_ON or action == SOFT_DROP_OFF:
+                soft_drop = action == SOFT_DROP_ON
+            else:
+                apply_action(board, action, history)
+                history.track()
+        if not board.game_over:
+            board.apply_gravity(TICK_MS, soft_drop)
+            history.track()
+    return board, recorder, end_tick
+
+
+class TestReplay(unittest.TestCase):
+    def test_round_trip(self):
+        for seed in range(3):
+            board, recorder, end_tick = record_game(seed, 3000, random.Random(seed))
+            replay = Replay.decode(recorder.encode(end_tick))
+            self.assertEqual((replay.seed, replay.logic_rate, replay.end_tick),
+                             (board.seed, 60, end_tick))
+            self.assertEqual(replay.actions, recorder.actions)
+            for board_class in (Board, BitBoard):
+                played = replay.play(board_class)
+                self.assertEqual(played.grid, board.grid)
+                self.assertEqual((played.score, played.lines_cleared, played.stream_index,
+                                  played.game_over),
+                                 (board.score, board.lines_cleared, board.stream_index,
+                                  board.game_over))
+
+    def test_seed_is_normalised(self):
+        board = Board(-1)
+        self.assertEqual(board.seed, SEED_MASK)
+        self.assertEqual(Board(SEED_MASK + 5).seed, 4)
+        replay = Replay.decode(ReplayRecorder(board.seed).encode(0))
+        self.assertEqual(replay.seed, board.seed)
+        self.assertEqual(replay.play().stream[0], Board(-1).stream[0])
+
+    def test_bad_recorder_seed(self):
+        with self.assertRaises(ValueError):
+            ReplayRecorder(-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,20 @@
+import unittest
+from constants import BLOCK_SIZE
+from sprites import BLOCK_STYLES, SpriteCache
+
+
+class TestSpriteCache(unittest.TestCase):
+    def test_styles(self):
+        cache = SpriteCache()
+        for style in BLOCK_STYLES:
+            sprite = cache.get(1, BLOCK_SIZE, style)
+            self.assertEqual(sprite.get_size(), (BLOCK_SIZE, BLOCK_SIZE))
+            self.assertIs(cache.get(1, BLOCK_SIZE, style), sprite)
+
+    def test_unknown_style(self):
+        with self.assertRaises(ValueError):
+            SpriteCache().get(1, BLOCK_SIZE, 'shiny')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,8 @@
 from game import Game
+from frame_profiler import profiler_from_env
 
 def main():
-    game = Game()
+    game = Game(profiler=profiler_from_env())
     game.run()
 
 if __name__ == "__main__":
@@ -86,11 +86,53 @@ SHAPE_COLORS = {
     'L': ORANGE
 }
 
+class RowBoard:
+    """Board rows stored behind an index array.
+
+    board[y] is the row currently shown at height y. Clearing lines rewrites
+    the index array and recycles the cleared row buffers as the new empty
+    rows at the top, so no cells are copied between rows.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.rows = [[None] * width for _ in range(height)]
+        self.order = list(range(height))
+        self.empty_row = [None] * width
+
+    def __getitem__(self, y: int) -> list:
+        return self.rows[self.order[y]]
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self):
+        rows = self.rows
+        return (rows[index] for index in self.order)
+
+    def is_full(self, y: int) -> bool:
+        """Check whether every cell of row y is filled."""
+        return None not in self.rows[self.order[y]]
+
+    def remove_rows(self, ys: List[int]):
+        """Remove the given rows (sorted top to bottom) and drop the rows above them."""
+        cleared = set(ys)
+        recycled = [self.order[y] for y in ys]
+        for index in recycled:
+            self.rows[index][:] = self.empty_row
+        # Only rows above the lowest cleared one change height
+        lowest = ys[-1]
+        kept = [index for y, index in enumerate(self.order[:lowest + 1]) if y not in cleared]
+        self.order[:lowest + 1] = recycled + kept
+
 class GameState:
     """Manages the game state including board, current piece, score, etc."""
     
-    def __init__(self):
-        self.board = [[None] * BOARD_WIDTH for _ in range(BOARD_HEIGHT)]
+    def __init__(self, width: int = BOARD_WIDTH, height: int = BOARD_HEIGHT):
+        self.width = width
+        self.height = height
+        self.board = RowBoard(width, height)
         self.score = 0
         self.level = 1
         self.lines_cleared = 0
@@ -111,7 +153,7 @@ class GameState:
         return {
             'shape': shape_name,
             'rotation': 0,
-            'x': BOARD_WIDTH // 2 - 2,
+            'x': self.width // 2 - 2,
             'y': 0
         }
 
@@ -123,20 +165,22 @@ class GameState:
     def is_valid_move(self, piece: dict) -> bool:
         """Check if the piece's current position is valid."""
         for x, y in self.get_piece_positions(piece):
-            if (x < 0 or x >= BOARD_WIDTH or 
-                y >= BOARD_HEIGHT or 
+            if (x < 0 or x >= self.width or 
+                y >= self.height or 
                 (y >= 0 and self.board[y][x] is not None)):
                 return False
         return True
 
     def lock_piece(self):
         """Lock the current piece in place and spawn a new one."""
+        rows = set()
         for x, y in self.get_piece_positions(self.current_piece):
             if y >= 0:  # Only place piece if it's on the board
                 self.board[y][x] = self.current_piece['shape']
+                rows.add(y)
         
-        # Clear lines and update score
-        lines_cleared = self.clear_lines()
+        # Clear lines and update score; only the rows just filled can be full
+        lines_cleared = self.clear_lines(rows)
         self.update_score(lines_cleared)
         
         # Get next piece
@@ -147,20 +191,14 @@ class GameState:
         if not self.is_valid_move(self.current_piece):
             self.game_over = True
 
-    def clear_lines(self) -> int:
-        """Clear full lines and return the number of lines cleared."""
-        lines_cleared = 0
-        y = BOARD_HEIGHT - 1
-        while y >= 0:
-            if all(cell is not None for cell in self.board[y]):
-                lines_cleared += 1
-                # Move all lines above down
-                for y2 in range(y, 0, -1):
-                    self.board[y2] = self.board[y2 - 1][:]
-                self.board[0] = [None] * BOARD_WIDTH
-            else:
-                y -= 1
-        return lines_cleared
+    def clear_lines(self, rows=None) -> int:
+        """Clear full lines (among `rows`, default all) and return how many were cleared."""
+        if rows is None:
+            rows = range(self.height)
+        full = sorted(y for y in rows if self.board.is_full(y))
+        if full:
+            self.board.remove_rows(full)
+        return len(full)
 
     def update_score(self, lines_cleared: int):
         """Update score based on lines cleared."""
@@ -310,102 +310,107 @@ class TetrisGame:
                 return  # If locking caused game over (piece at top), skip spawning new piece
             self.current_piece = self.new_piece()
 
-# Initialize game window
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Tetris")
+def main():
+    """Open the window and run the game loop until the player quits."""
+    # Initialize game window
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Tetris")
 
-clock = pygame.time.Clock()
-font = pygame.font.Font(None, 36)  # Font for score and level display
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 36)  # Font for score and level display
 
-# Game loop
-game = TetrisGame()
-fall_time = 0             # time accumulator for piece falling
-base_fall_delay = 500     # base fall interval in milliseconds (will be adjusted by level)
+    # Game loop
+    game = TetrisGame()
+    fall_time = 0             # time accumulator for piece falling
+    base_fall_delay = 500     # base fall interval in milliseconds (will be adjusted by level)
 
-running = True
-while running:
-    dt = clock.tick(FPS)  # limit framerate and get time since last frame (ms)
-    fall_time += dt
+    running = True
+    while running:
+        dt = clock.tick(FPS)  # limit framerate and get time since last frame (ms)
+        fall_time += dt
 
-    # Handle events (keyboard input and window close)
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False  # exit game loop
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_LEFT:
-                # move left if possible
-                if game.valid_move(game.current_piece, dx=-1, dy=0):
-                    game.current_piece.x -= 1
-            elif event.key == pygame.K_RIGHT:
-                # move right if possible
-                if game.valid_move(game.current_piece, dx=1, dy=0):
-                    game.current_piece.x += 1
-            elif event.key == pygame.K_DOWN:
-                # soft drop: move down faster by one cell
-                if game.valid_move(game.current_piece, dx=0, dy=1):
-                    game.current_piece.y += 1
-            elif event.key == pygame.K_UP:
-                # rotate piece if possible
-                if game.valid_move(game.current_piece, dx=0, dy=0, dr=1):
-                    game.current_piece.rotate()
-            elif event.key == pygame.K_SPACE:
-                # hard drop: move piece straight down to the bottom
-                while game.valid_move(game.current_piece, dx=0, dy=1):
-                    game.current_piece.y += 1
-                # Once it can't move further, lock it in place
+        # Handle events (keyboard input and window close)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False  # exit game loop
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_LEFT:
+                    # move left if possible
+                    if game.valid_move(game.current_piece, dx=-1, dy=0):
+                        game.current_piece.x -= 1
+                elif event.key == pygame.K_RIGHT:
+                    # move right if possible
+                    if game.valid_move(game.current_piece, dx=1, dy=0):
+                        game.current_piece.x += 1
+                elif event.key == pygame.K_DOWN:
+                    # soft drop: move down faster by one cell
+                    if game.valid_move(game.current_piece, dx=0, dy=1):
+                        game.current_piece.y += 1
+                elif event.key == pygame.K_UP:
+                    # rotate piece if possible
+                    if game.valid_move(game.current_piece, dx=0, dy=0, dr=1):
+                        game.current_piece.rotate()
+                elif event.key == pygame.K_SPACE:
+                    # hard drop: move piece straight down to the bottom
+                    while game.valid_move(game.current_piece, dx=0, dy=1):
+                        game.current_piece.y += 1
+                    # Once it can't move further, lock it in place
+                    game.lock_piece(game.current_piece)
+                    if game.game_over:
+                        # If piece reached top, end game loop
+                        running = False
+                    else:
+                        game.current_piece = game.new_piece()
+
+        # Auto fall based on timer and current level speed
+        # Decrease the delay as level increases (faster drop)
+        fall_delay = max(50, base_fall_delay - (game.level - 1) * 50)  # speed up by 50ms each level (min 50ms)
+        if fall_time >= fall_delay:
+            fall_time = 0
+            # Move the piece down or lock if it can't move further
+            if game.valid_move(game.current_piece, dx=0, dy=1):
+                game.current_piece.y += 1
+            else:
                 game.lock_piece(game.current_piece)
                 if game.game_over:
-                    # If piece reached top, end game loop
+                    # End game if new piece cannot spawn (stack overflow)
                     running = False
                 else:
                     game.current_piece = game.new_piece()
 
-    # Auto fall based on timer and current level speed
-    # Decrease the delay as level increases (faster drop)
-    fall_delay = max(50, base_fall_delay - (game.level - 1) * 50)  # speed up by 50ms each level (min 50ms)
-    if fall_time >= fall_delay:
-        fall_time = 0
-        # Move the piece down or lock if it can't move further
-        if game.valid_move(game.current_piece, dx=0, dy=1):
-            game.current_piece.y += 1
-        else:
-            game.lock_piece(game.current_piece)
-            if game.game_over:
-                # End game if new piece cannot spawn (stack overflow)
-                running = False
-            else:
-                game.current_piece = game.new_piece()
+        # Drawing section
+        screen.fill(BLACK)                          # clear screen
+        game.draw_board(screen)                     # draw the stacked blocks
+        game.draw_current_piece(screen)             # draw the falling piece
+        # Draw score and level text
+        score_text = font.render(f"Score: {game.score}", True, WHITE)
+        level_text = font.render(f"Level: {game.level}", True, WHITE)
+        screen.blit(score_text, (10, 10))
+        screen.blit(level_text, (10, 40))
+        # If game over, draw "Game Over" message
+        if game.game_over:
+            game_over_font = pygame.font.Font(None, 72)
+            msg = game_over_font.render("GAME OVER", True, RED)
+            screen.blit(msg, (WIDTH//2 - msg.get_width()//2, HEIGHT//2 - 30))
+            sub_msg = font.render("Press any key to exit", True, WHITE)
+            screen.blit(sub_msg, (WIDTH//2 - sub_msg.get_width()//2, HEIGHT//2 + 40))
+            pygame.display.flip()
+            # Pause the loop until a key is pressed or window closed
+            waiting = True
+            while waiting:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        waiting = False
+                        running = False
+                    elif event.type == pygame.KEYDOWN:
+                        waiting = False
+            # After a key press, break out of the game loop
+            break
 
-    # Drawing section
-    screen.fill(BLACK)                          # clear screen
-    game.draw_board(screen)                     # draw the stacked blocks
-    game.draw_current_piece(screen)             # draw the falling piece
-    # Draw score and level text
-    score_text = font.render(f"Score: {game.score}", True, WHITE)
-    level_text = font.render(f"Level: {game.level}", True, WHITE)
-    screen.blit(score_text, (10, 10))
-    screen.blit(level_text, (10, 40))
-    # If game over, draw "Game Over" message
-    if game.game_over:
-        game_over_font = pygame.font.Font(None, 72)
-        msg = game_over_font.render("GAME OVER", True, RED)
-        screen.blit(msg, (WIDTH//2 - msg.get_width()//2, HEIGHT//2 - 30))
-        sub_msg = font.render("Press any key to exit", True, WHITE)
-        screen.blit(sub_msg, (WIDTH//2 - sub_msg.get_width()//2, HEIGHT//2 + 40))
         pygame.display.flip()
-        # Pause the loop until a key is pressed or window closed
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    waiting = False
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    waiting = False
-        # After a key press, break out of the game loop
-        break
 
-    pygame.display.flip()
+    # Clean up and quit
+    pygame.quit()
 
-# Clean up and quit
-pygame.quit()
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,11 @@ import random
 import time
 import os
 
+try:
+    import curses
+except ImportError:  # Windows needs the windows-curses package
+    curses = None
+
 # Define shapes of tetrominoes
 TETROMINOES = {
     'I': [(0, 0), (1, 0), (2, 0), (3, 0)],
@@ -16,21 +21,23 @@ TETROMINOES = {
 # Game board dimensions
 WIDTH, HEIGHT = 10, 20
 
+# Seconds between gravity steps in the curses front end
+FALL_INTERVAL = 0.5
+
 def rotate(piece):
     return [(-y, x) for x, y in piece]
 
 def create_board():
     return [[0 for _ in range(WIDTH)] for _ in range(HEIGHT)]
 
-def draw_board(board, piece=None):
-    if piece:
-        tmp_board = [row[:] for row in board]
-        for x, y in piece:
-            tmp_board[y][x] = 'X'
-        board = tmp_board
+def board_lines(board, piece=None):
+    cells = set(piece or ())
+    return [''.join(['#' if cell or (x, y) in cells else '.' for x, cell in enumerate(row)])
+            for y, row in enumerate(board)]
 
-    for row in board:
-        print(''.join(['#' if cell else '.' for cell in row]))
+def draw_board(board, piece=None):
+    for line in board_lines(board, piece):
+        print(line)
 
 def new_piece():
     shape = random.choice(list(TETROMINOES.keys()))
@@ -45,6 +52,21 @@ def collides(board, piece):
             return True
     return False
 
+def lock_piece(board, piece):
+    # Returns False if part of the piece is still above the board
+    for x, y in piece:
+        if y < 0:
+            return False
+        board[y][x] = 1
+    return True
+
+def fall(board, piece):
+    # One gravity step: returns (piece, lines cleared, game over)
+    if not collides(board, move(piece, 0, 1)):
+        return move(piece, 0, 1), 0, False
+    game_over = not lock_piece(board, piece)
+    return new_piece(), clear_lines(board), game_over
+
 def clear_lines(board):
     lines_cleared = 0
     for y in range(HEIGHT - 1, -1, -1):
@@ -77,20 +99,105 @@ def main():
             current_piece = rotate(current_piece)
 
         # Move piece down
-        if not collides(board, move(current_piece, 0, 1)):
-            current_piece = move(current_piece, 0, 1)
-        else:
-            for x, y in current_piece:
-                if y < 0:
-                    game_over = True
-                    break
-                board[y][x] = 1
-            score += clear_lines(board) * 100
-            current_piece = new_piece()
+        current_piece, lines, lost = fall(board, current_piece)
+        score += lines * 100
+        game_over = game_over or lost
 
         time.sleep(0.1)  # A small delay to control game speed
 
     print("Game Over! Your Score:", score)
 
+class TerminalRenderer:
+    # Remembers what is on the terminal and writes only the runs of
+    # characters that changed, so a tick sends a few bytes, not the board
+    def __init__(self, screen):
+        self.screen = screen
+        self.lines = []
+
+    def invalidate(self):
+        self.screen.clear()
+        self.lines = []
+
+    def draw(self, lines):
+        for y, line in enumerate(lines):
+            old = self.lines[y] if y < len(self.lines) else ''
+            if line == old:
+                continue
+            width = max(len(line), len(old))
+            line, old = line.ljust(width), old.ljust(width)
+            x = 0
+            while x < width:
+                if line[x] == old[x]:
+                    x += 1
+                    continue
+                end = x + 1
+                while end < width and line[end] != old[end]:
+                    end += 1
+                self.write(y, x, line[x:end])
+                x = end
+        for y in range(len(lines), len(self.lines)):
+            self.write(y, 0, ' ' * len(self.lines[y]))
+        self.lines = list(lines)
+        self.screen.refresh()
+
+    def write(self, y, x, text):
+        try:
+            self.screen.addstr(y, x, text)
+        except curses.error:
+            pass  # Off the edge of a small terminal
+
+def play_curses(screen):
+    # Curses front end: keys are read without blocking the game, gravity
+    # runs on its own timer and the screen is updated differentially
+    try:
+        curses.curs_set(0)
+    except curses.error:
+        pass
+    renderer = TerminalRenderer(screen)
+    board = create_board()
+    score = 0
+    current_piece = new_piece()
+    game_over = False
+    next_fall = time.monotonic() + FALL_INTERVAL
+    changed = True
+
+    while not game_over:
+        if changed:
+            renderer.draw(board_lines(board, current_piece) +
+                          ['', f"Score: {score}", "a/d move  space rotate  s down  q quit"])
+            changed = False
+
+        # Wait for a key, but never past the next gravity step
+        screen.timeout(max(0, int((next_fall - time.monotonic()) * 1000)))
+        key = screen.getch()
+        candidate = None
+        if key in (ord('q'), ord('Q')):
+            break
+        elif key in (ord('a'), curses.KEY_LEFT):
+            candidate = move(current_piece, -1, 0)
+        elif key in (ord('d'), curses.KEY_RIGHT):
+            candidate = move(current_piece, 1, 0)
+        elif key in (ord(' '), curses.KEY_UP):
+            candidate = rotate(current_piece)
+        elif key in (ord('s'), curses.KEY_DOWN):
+            candidate = move(current_piece, 0, 1)
+        elif key == curses.KEY_RESIZE:
+            renderer.invalidate()
+            changed = True
+        if candidate and not collides(board, candidate):
+            current_piece = candidate
+            changed = True
+
+        now = time.monotonic()
+        if now >= next_fall:
+            next_fall = now + FALL_INTERVAL
+            current_piece, lines, game_over = fall(board, current_piece)
+            score += lines * 100
+            changed = True
+    return score
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if curses is None:
+        main()
+    else:
+        print("Game Over! Your Score:", curses.wrapper(play_curses))
\ No newline at end of file
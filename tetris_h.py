@@ -123,15 +123,20 @@ def convert_shape_format(piece):
     return positions
 
 def valid_space(piece, grid):
-    accepted_positions = [[(x, y) for x in range(GRID_WIDTH) if grid[y][x] == BLACK] for y in range(GRID_HEIGHT)]
-    accepted_positions = [x for sub in accepted_positions for x in sub]
-    formatted = convert_shape_format(piece)
-    for pos in formatted:
-        if pos not in accepted_positions:
-            if pos[1] > -1:
-                return False
+    # Cells above the top edge are always allowed; any other cell must be an
+    # empty square on the board
+    for x, y in convert_shape_format(piece):
+        if y > -1 and not (0 <= x < GRID_WIDTH and y < GRID_HEIGHT and grid[y][x] == BLACK):
+            return False
     return True
 
+def lock_piece(grid, locked, positions, color):
+    # Add a landed piece to the locked cells and to the grid
+    for x, y in positions:
+        locked[(x, y)] = color
+        if y > -1:
+            grid[y][x] = color
+
 def check_lost(positions):
     for pos in positions:
         x, y = pos
@@ -153,24 +158,23 @@ def draw_grid(surface, grid):
         pygame.draw.line(surface, GRAY, (x * BLOCK_SIZE, 0), (x * BLOCK_SIZE, SCREEN_HEIGHT))
 
 def clear_rows(grid, locked):
-    increment = 0
-    for y in range(GRID_HEIGHT-1, -1, -1):
-        row = grid[y]
-        if BLACK not in row:
-            increment += 1
-            ind = y
-            for x in range(GRID_WIDTH):
-                try:
-                    del locked[(x, y)]
-                except:
-                    continue
-    if increment > 0:
-        for key in sorted(list(locked), key=lambda x: x[1])[::-1]:
-            x, y = key
-            if y < ind:
-                new_key = (x, y + increment)
-                locked[new_key] = locked.pop(key)
-    return increment
+    # Remove full rows from the grid in place, then bring the locked cells
+    # of every row that moved (from the top of the stack down to the lowest
+    # cleared row) in line
+    full = [y for y, row in enumerate(grid) if BLACK not in row]
+    if not full:
+        return 0
+    top = next(y for y, row in enumerate(grid) if row.count(BLACK) < GRID_WIDTH)
+    for y in full:
+        del grid[y]
+        grid.insert(0, [BLACK for _ in range(GRID_WIDTH)])
+    for y in range(top, full[-1] + 1):
+        for x, color in enumerate(grid[y]):
+            if color == BLACK:
+                locked.pop((x, y), None)
+            else:
+                locked[(x, y)] = color
+    return len(full)
 
 def draw_window(surface, grid, score=0):
     surface.fill(BLACK)
@@ -185,18 +189,17 @@ def main():
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption('Tetris')
     clock = pygame.time.Clock()
-    grid = create_grid()
+    locked_positions = {}
+    grid = create_grid(locked_positions)
     change_piece = False
     run = True
     current_piece = get_shape()
     next_piece = get_shape()
-    locked_positions = {}
     score = 0
     fall_time = 0
     fall_speed = 0.27
 
     while run:
-        grid = create_grid(locked_positions)
         fall_time += clock.get_rawtime()
         clock.tick()
 
@@ -231,21 +234,23 @@ def main():
                         current_piece.rotate()
 
         shape_pos = convert_shape_format(current_piece)
-        for pos in shape_pos:
-            x, y = pos
-            if y > -1:
-                grid[y][x] = current_piece.color
+        # The grid only holds locked cells between frames; the falling piece
+        # is painted in for drawing and the squares it covers put back after
+        covered = [(x, y, grid[y][x]) for x, y in shape_pos if y > -1]
+        for x, y, _ in covered:
+            grid[y][x] = current_piece.color
 
         if change_piece:
-            for pos in shape_pos:
-                p = (pos[0], pos[1])
-                locked_positions[p] = current_piece.color
+            lock_piece(grid, locked_positions, shape_pos, current_piece.color)
+            covered = []
             current_piece = next_piece
             next_piece = get_shape()
             change_piece = False
             score += clear_rows(grid, locked_positions) * 10
 
         draw_window(screen, grid, score)
+        for x, y, color in covered:
+            grid[y][x] = color
 
         if check_lost(locked_positions):
             run = False
@@ -4,6 +4,8 @@ import random
 import os
 import json
 from typing import List, Tuple
+from text_cache import TextCache
+from frame_profiler import profiler_from_env
 
 ###############################################################################
 # CONSTANTS & CONFIG
@@ -162,6 +164,15 @@ SHAPES = {
 
 PIECE_TYPES = list(SHAPES.keys())
 
+# Lowest filled row of every occupied column, per shape and rotation:
+# BOTTOM_PROFILES[shape][rotation] = [(col, row), ...]
+BOTTOM_PROFILES = {
+    shape: [[(col, max(row for row in range(4) if matrix[row][col]))
+             for col in range(4) if any(matrix[row][col] for row in range(4))]
+            for matrix in rotations]
+    for shape, rotations in SHAPES.items()
+}
+
 # Scoring
 LINE_SCORES = [0, 100, 300, 500, 800]  # 0, single, double, triple, tetris
 
@@ -225,6 +236,7 @@ class Board:
         self.last_drop_time = 0
         self.game_over = False
         self.lock_delay = 500  # ms
+        self.column_tops = None  # Cached first filled row per column
 
     def generate_piece(self):
         return Piece(random.choice(PIECE_TYPES), GRID_WIDTH//2 - 2, 0)
@@ -287,11 +299,35 @@ class Board:
             # revert rotation if not possible
             self.current_piece.rotation = old_rot
 
+    def get_column_tops(self):
+        # The grid only changes when a piece locks, so this is rebuilt at
+        # most once per piece
+        if self.column_tops is None:
+            self.column_tops = [next((y for y in range(GRID_HEIGHT) if self.grid[y][x] is not None),
+                                     GRID_HEIGHT)
+                                for x in range(GRID_WIDTH)]
+        return self.column_tops
+
+    def drop_distance(self, piece: Piece) -> int:
+        # Compare the piece's bottom profile with the column tops in one
+        # pass; under an overhang, fall back to stepping down
+        tops = self.get_column_tops()
+        distance = GRID_HEIGHT
+        for col, row in BOTTOM_PROFILES[piece.shape_type][piece.rotation]:
+            gap = tops[piece.x + col] - (piece.y + row) - 1
+            if gap < 0:
+                ghost = Piece(piece.shape_type, piece.x, piece.y)
+                ghost.rotation = piece.rotation
+                while self.is_valid_position(ghost):
+                    ghost.y += 1
+                return ghost.y - 1 - piece.y
+            distance = min(distance, gap)
+        return distance
+
     def hard_drop(self):
-        dist = 0
-        while self.move(0,1):
-            dist += 1
-            self.score += 2  # hard drop scoring
+        dist = self.drop_distance(self.current_piece)
+        self.current_piece.y += dist
+        self.score += 2 * dist  # hard drop scoring
         self.lock_piece()
 
     def soft_drop(self):
@@ -304,6 +340,7 @@ class Board:
         for x,y in self.current_piece.get_positions():
             if 0 <= y < GRID_HEIGHT:
                 self.grid[y][x] = self.current_piece.color
+        self.column_tops = None
         self.clear_lines()
         self.spawn_piece()
 
@@ -327,24 +364,25 @@ class Board:
     def get_ghost_piece(self):
         if self.current_piece is None:
             return None
-        ghost = Piece(self.current_piece.shape_type, self.current_piece.x, self.current_piece.y)
+        dist = self.drop_distance(self.current_piece)
+        if dist == 0:
+            return None
+        ghost = Piece(self.current_piece.shape_type, self.current_piece.x, self.current_piece.y + dist)
         ghost.rotation = self.current_piece.rotation
-        while self.is_valid_position(ghost):
-            ghost.y += 1
-        ghost.y -= 1
-        return ghost if ghost.y != self.current_piece.y else None
+        return ghost
 
 ###############################################################################
 # GAME CLASS
 ###############################################################################
 class Game:
-    def __init__(self):
+    def __init__(self, profiler=None):
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Tetris")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
+        self.text = TextCache()
         self.running = True
         self.board = Board()
         self.board.spawn_piece()
@@ -354,39 +392,63 @@ class Game:
         self.last_move_side = pygame.time.get_ticks()
         self.last_fall = pygame.time.get_ticks()
         self.score_saved = False
+        # Optional frame_profiler.FrameProfiler; F3 toggles its overlay
+        self.profiler = profiler
 
     def run(self):
         while self.running:
+            if self.profiler:
+                self.profiler.begin_frame()
             if self.state == "menu":
                 self.handle_menu_events()
+                self.mark("input")
                 self.draw_menu()
             elif self.state == "playing":
                 self.handle_play_events()
+                self.mark("input")
                 self.update()
+                self.mark("update")
                 self.draw()
             elif self.state == "paused":
                 self.handle_pause_events()
+                self.mark("input")
                 self.draw_pause()
             elif self.state == "gameover":
                 self.handle_gameover_events()
+                self.mark("input")
                 self.draw_gameover()
+            if self.profiler and self.profiler.overlay:
+                self.profiler.draw_overlay(self.screen, self.small_font,
+                                           (PLAY_AREA_X + PLAY_AREA_WIDTH + 50, PLAY_AREA_Y + 400))
+            self.mark("draw")
             self.clock.tick(FPS)
+            self.mark(None)
             pygame.display.flip()
+            self.mark("draw")
+
+    def mark(self, phase):
+        if self.profiler:
+            self.profiler.mark(phase)
+
+    def handle_profiler_key(self, event):
+        if event.key == pygame.K_F3 and self.profiler:
+            self.profiler.toggle_overlay()
 
     def handle_menu_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.quit_game()
             elif event.type == pygame.KEYDOWN:
+                self.handle_profiler_key(event)
                 if event.key == pygame.K_RETURN:
                     self.state = "playing"
                     self.reset_game()
 
     def draw_menu(self):
         self.screen.fill(BLACK)
-        title_text = self.font.render("TETRIS", True, WHITE)
-        info_text = self.small_font.render("Press ENTER to start", True, WHITE)
-        high_score_text = self.small_font.render(f"High Score: {self.data['high_score']}", True, WHITE)
+        title_text = self.text.render(self.font, "TETRIS", WHITE)
+        info_text = self.text.render(self.small_font, "Press ENTER to start", WHITE)
+        high_score_text = self.text.render(self.small_font, f"High Score: {self.data['high_score']}", WHITE)
 
         self.screen.blit(title_text, (WINDOW_WIDTH//2 - title_text.get_width()//2, 200))
         self.screen.blit(info_text, (WINDOW_WIDTH//2 - info_text.get_width()//2, 300))
@@ -397,6 +459,7 @@ class Game:
             if event.type == pygame.QUIT:
                 self.quit_game()
             elif event.type == pygame.KEYDOWN:
+                self.handle_profiler_key(event)
                 if event.key == pygame.K_ESCAPE:
                     self.state = "paused"
                 elif event.key == pygame.K_LEFT:
@@ -460,23 +523,23 @@ class Game:
 
     def draw_sidebar(self):
         # Next piece
-        next_piece_label = self.small_font.render("Next:", True, WHITE)
+        next_piece_label = self.text.render(self.small_font, "Next:", WHITE)
         self.screen.blit(next_piece_label, (PLAY_AREA_X + PLAY_AREA_WIDTH + 50, PLAY_AREA_Y))
         next_piece_shape = self.board.next_piece.get_shape()
         self.draw_shape(next_piece_shape, self.board.next_piece.color, PLAY_AREA_X + PLAY_AREA_WIDTH + 50, PLAY_AREA_Y + 30)
 
         # Hold piece
-        hold_label = self.small_font.render("Hold:", True, WHITE)
+        hold_label = self.text.render(self.small_font, "Hold:", WHITE)
         self.screen.blit(hold_label, (PLAY_AREA_X + PLAY_AREA_WIDTH + 50, PLAY_AREA_Y + 120))
         if self.board.hold_piece:
             hold_shape = self.board.hold_piece.get_shape()
             self.draw_shape(hold_shape, self.board.hold_piece.color, PLAY_AREA_X + PLAY_AREA_WIDTH + 50, PLAY_AREA_Y + 150)
 
         # Score & Level
-        score_text = self.small_font.render(f"Score: {self.board.score}", True, WHITE)
-        level_text = self.small_font.render(f"Level: {self.board.level}", True, WHITE)
-        lines_text = self.small_font.render(f"Lines: {self.board.lines_cleared}", True, WHITE)
-        high_score_text = self.small_font.render(f"High: {self.data['high_score']}", True, WHITE)
+        score_text = self.text.label("score", self.small_font, f"Score: {self.board.score}", WHITE)
+        level_text = self.text.label("level", self.small_font, f"Level: {self.board.level}", WHITE)
+        lines_text = self.text.label("lines", self.small_font, f"Lines: {self.board.lines_cleared}", WHITE)
+        high_score_text = self.text.label("high", self.small_font, f"High: {self.data['high_score']}", WHITE)
 
         self.screen.blit(score_text, (PLAY_AREA_X + PLAY_AREA_WIDTH + 50, PLAY_AREA_Y + 250))
         self.screen.blit(level_text, (PLAY_AREA_X + PLAY_AREA_WIDTH + 50, PLAY_AREA_Y + 280))
@@ -503,12 +566,13 @@ class Game:
             if event.type == pygame.QUIT:
                 self.quit_game()
             elif event.type == pygame.KEYDOWN:
+                self.handle_profiler_key(event)
                 if event.key == pygame.K_ESCAPE:
                     self.state = "playing"
 
     def draw_pause(self):
         self.draw()
-        pause_text = self.font.render("PAUSED", True, WHITE)
+        pause_text = self.text.render(self.font, "PAUSED", WHITE)
         self.screen.blit(pause_text, (WINDOW_WIDTH//2 - pause_text.get_width()//2, WINDOW_HEIGHT//2))
 
     def handle_gameover_events(self):
@@ -516,13 +580,14 @@ class Game:
             if event.type == pygame.QUIT:
                 self.quit_game()
             elif event.type == pygame.KEYDOWN:
+                self.handle_profiler_key(event)
                 if event.key == pygame.K_RETURN:
                     self.state = "menu"
 
     def draw_gameover(self):
         self.draw()
-        go_text = self.font.render("GAME OVER", True, WHITE)
-        restart_text = self.small_font.render("Press ENTER to return to menu", True, WHITE)
+        go_text = self.text.render(self.font, "GAME OVER", WHITE)
+        restart_text = self.text.render(self.small_font, "Press ENTER to return to menu", WHITE)
         self.screen.blit(go_text, (WINDOW_WIDTH//2 - go_text.get_width()//2, WINDOW_HEIGHT//2))
         self.screen.blit(restart_text, (WINDOW_WIDTH//2 - restart_text.get_width()//2, WINDOW_HEIGHT//2 + 50))
 
@@ -532,6 +597,8 @@ class Game:
         self.score_saved = False
 
     def quit_game(self):
+        if self.profiler:
+            self.profiler.close()
         pygame.quit()
         sys.exit()
 
@@ -539,5 +606,5 @@ class Game:
 # MAIN EXECUTION
 ###############################################################################
 if __name__ == "__main__":
-    game = Game()
+    game = Game(profiler_from_env())
     game.run()
\ No newline at end of file
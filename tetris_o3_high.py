@@ -158,16 +158,20 @@ def convert_shape_format(piece):
     return positions
 
 def valid_space(piece, grid):
-    accepted_positions = [(x, y) for y in range(20) for x in range(10) if grid[y][x] == (0, 0, 0)]
-    formatted = convert_shape_format(piece)
-    
-    for pos in formatted:
-        x, y = pos
-        if pos not in accepted_positions:
-            if y >= 0:
-                return False
+    # Cells above the top edge are always allowed; any other cell must be an
+    # empty square on the board
+    for x, y in convert_shape_format(piece):
+        if y >= 0 and not (0 <= x < 10 and y < 20 and grid[y][x] == (0, 0, 0)):
+            return False
     return True
 
+def lock_piece(grid, locked, positions, color):
+    # Add a landed piece to the locked cells and to the grid
+    for x, y in positions:
+        locked[(x, y)] = color
+        if y > -1:
+            grid[y][x] = color
+
 def check_lost(locked_positions):
     for pos in locked_positions:
         x, y = pos
@@ -196,25 +200,23 @@ def draw_grid(surface, grid):
             pygame.draw.line(surface, (128, 128, 128), (sx + x * block_size, sy), (sx + x * block_size, sy + play_height))
 
 def clear_rows(grid, locked):
-    # Check each row from bottom to top to see if it is full
-    inc = 0
-    for y in range(len(grid)-1, -1, -1):
-        row = grid[y]
-        if (0, 0, 0) not in row:
-            inc += 1
-            # Remove the blocks in this row from locked positions
-            for x in range(len(row)):
-                try:
-                    del locked[(x, y)]
-                except:
-                    continue
-            # Shift every row above down
-            for key in sorted(list(locked), key=lambda k: k[1], reverse=True):
-                x, y2 = key
-                if y2 < y:
-                    newKey = (x, y2 + 1)
-                    locked[newKey] = locked.pop(key)
-    return inc
+    # Remove full rows from the grid in place, then bring the locked cells
+    # of every row that moved (from the top of the stack down to the lowest
+    # cleared row) in line
+    full = [y for y, row in enumerate(grid) if (0, 0, 0) not in row]
+    if not full:
+        return 0
+    top = next(y for y, row in enumerate(grid) if row.count((0, 0, 0)) < 10)
+    for y in full:
+        del grid[y]
+        grid.insert(0, [(0, 0, 0) for _ in range(10)])
+    for y in range(top, full[-1] + 1):
+        for x, color in enumerate(grid[y]):
+            if color == (0, 0, 0):
+                locked.pop((x, y), None)
+            else:
+                locked[(x, y)] = color
+    return len(full)
 
 def draw_next_shape(piece, surface):
     font = pygame.font.SysFont('comicsans', 30)
@@ -275,7 +277,6 @@ def main(win):
     score = 0
 
     while run:
-        grid = create_grid(locked_positions)
         fall_time += clock.get_rawtime()
         level_time += clock.get_rawtime()
         clock.tick()
@@ -321,16 +322,16 @@ def main(win):
 
         shape_pos = convert_shape_format(current_piece)
 
-        # Add piece to grid for drawing
-        for pos in shape_pos:
-            x, y = pos
-            if y > -1:
-                grid[y][x] = current_piece.color
+        # Add piece to grid for drawing; the grid only holds locked cells
+        # between frames, so the squares it covers are put back afterwards
+        covered = [(x, y, grid[y][x]) for x, y in shape_pos if y > -1]
+        for x, y, _ in covered:
+            grid[y][x] = current_piece.color
 
         # If piece hit the ground, lock it and generate a new one
         if change_piece:
-            for pos in shape_pos:
-                locked_positions[(pos[0], pos[1])] = current_piece.color
+            lock_piece(grid, locked_positions, shape_pos, current_piece.color)
+            covered = []
             current_piece = next_piece
             next_piece = get_shape()
             change_piece = False
@@ -339,6 +340,8 @@ def main(win):
         draw_window(win, grid, score)
         draw_next_shape(next_piece, win)
         pygame.display.update()
+        for x, y, color in covered:
+            grid[y][x] = color
 
         if check_lost(locked_positions):
             draw_text_middle(win, "YOU LOST", 80, (255, 255, 255))
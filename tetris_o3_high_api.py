@@ -53,6 +53,7 @@ class TetrisGame:
         self.current_pos = [0, 0]  # (x, y) on board
         self.game_over = False
 
+        self.create_items()
         self.init_bindings()
         self.new_piece()
         self.game_loop()
@@ -141,32 +142,61 @@ class TetrisGame:
             new_board.insert(0, [None for _ in range(BOARD_WIDTH)])
         self.board = new_board
 
-    def draw_cell(self, x, y, color):
+    def cell_coords(self, x, y):
         x1 = x * CELL_SIZE
         y1 = y * CELL_SIZE
-        x2 = x1 + CELL_SIZE
-        y2 = y1 + CELL_SIZE
-        self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline='gray')
+        return x1, y1, x1 + CELL_SIZE, y1 + CELL_SIZE
+
+    def draw_cell(self, x, y, color):
+        return self.canvas.create_rectangle(*self.cell_coords(x, y), fill=color, outline='gray')
+
+    def create_items(self):
+        # Canvas items are created once: a hidden rectangle per board cell,
+        # four for the falling piece and the grid lines on top. redraw()
+        # then only reconfigures or moves them.
+        self.cell_items = [[self.draw_cell(x, y, 'black') for x in range(BOARD_WIDTH)]
+                           for y in range(BOARD_HEIGHT)]
+        self.cell_colors = [[None] * BOARD_WIDTH for _ in range(BOARD_HEIGHT)]
+        for row in self.cell_items:
+            for item in row:
+                self.canvas.itemconfig(item, state='hidden')
+        self.piece_items = [self.draw_cell(0, 0, 'black') for _ in range(4)]
+        self.piece_drawn = [None] * 4  # (coords, color) shown by each piece item
+        for item in self.piece_items:
+            self.canvas.itemconfig(item, state='hidden')
+        for i in range(BOARD_WIDTH + 1):
+            self.canvas.create_line(i*CELL_SIZE, 0, i*CELL_SIZE, BOARD_HEIGHT*CELL_SIZE, fill='white', dash=(2, 2))
+        for i in range(BOARD_HEIGHT + 1):
+            self.canvas.create_line(0, i*CELL_SIZE, BOARD_WIDTH*CELL_SIZE, i*CELL_SIZE, fill='white', dash=(2, 2))
 
     def redraw(self):
-        self.canvas.delete("all")
-        # Draw fixed board
+        # Fixed board: only cells whose color changed are touched
         for y in range(BOARD_HEIGHT):
+            row = self.board[y]
+            drawn = self.cell_colors[y]
             for x in range(BOARD_WIDTH):
-                if self.board[y][x] is not None:
-                    self.draw_cell(x, y, self.board[y][x])
-        # Draw current piece
+                color = row[x]
+                if color != drawn[x]:
+                    if color is None:
+                        self.canvas.itemconfig(self.cell_items[y][x], state='hidden')
+                    else:
+                        self.canvas.itemconfig(self.cell_items[y][x], fill=color, state='normal')
+                    drawn[x] = color
+        # Current piece: move its four items, hiding cells above the board
         px, py = self.current_pos
-        for (x, y) in self.current_piece:
-            board_x = px + x
+        for i, (x, y) in enumerate(self.current_piece):
+            item = self.piece_items[i]
             board_y = py + y
-            if board_y >= 0:
-                self.draw_cell(board_x, board_y, self.current_color)
-        # Draw grid lines
-        for i in range(BOARD_WIDTH + 1):
-            self.canvas.create_line(i*CELL_SIZE, 0, i*CELL_SIZE, BOARD_HEIGHT*CELL_SIZE, fill='white', dash=(2, 2))
-        for i in range(BOARD_HEIGHT + 1):
-            self.canvas.create_line(0, i*CELL_SIZE, BOARD_WIDTH*CELL_SIZE, i*CELL_SIZE, fill='white', dash=(2, 2))
+            shown = (self.cell_coords(px + x, board_y), self.current_color) if board_y >= 0 else None
+            if shown == self.piece_drawn[i]:
+                continue
+            if shown is None:
+                self.canvas.itemconfig(item, state='hidden')
+            else:
+                coords, color = shown
+                self.canvas.coords(item, *coords)
+                self.canvas.itemconfig(item, fill=color, state='normal')
+            self.piece_drawn[i] = shown
 
 
 def main():
@@ -0,0 +1,37 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    # Rendered text surfaces, reused until the text changes.
+    #   label()  - one surface per named HUD slot ("score", "level", ...),
+    #              re-rendered only when that slot's text changes
+    #   render() - any string, kept in an LRU of at most max_size surfaces
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.labels = {}
+        self.surfaces = OrderedDict()
+
+    def label(self, name, font, text, color, antialias=True):
+        key = (id(font), text, antialias, color)
+        cached = self.labels.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, font.render(text, antialias, color))
+            self.labels[name] = cached
+        return cached[1]
+
+    def render(self, font, text, color, antialias=True):
+        key = (id(font), text, antialias, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.labels.clear()
+        self.surfaces.clear()
\ No newline at end of file
@@ -0,0 +1,226 @@
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from board import Board
+from ai import DEFAULT_WEIGHTS, PlacementAI
+from batch import play_chunk
+
+# Genetic tuning of the PlacementAI evaluation weights. A candidate is a
+# unit-length weight vector over FEATURES; its fitness is the mean score
+# (constants.py scoring, via the real Board rules) over a fixed set of
+# seeded games, so every generation is compared on the same pieces. Games
+# run in a process pool, every (weights, seed, max_pieces) result is cached,
+# and the whole state - population, cache and RNG - is checkpointed after each
+# generation so an interrupted run resumes where it stopped.
+
+FEATURES = ('height', 'lines', 'holes', 'bumpiness', 'wells')
+PRECISION = 6  # Weights are rounded to this many decimals, so cache keys are exact
+
+
+def normalize(vector):
+    length = math.sqrt(sum(w * w for w in vector)) or 1.0
+    return tuple(round(w / length, PRECISION) for w in vector)
+
+
+def weights_dict(vector):
+    return dict(zip(FEATURES, vector))
+
+
+def random_vector(rng):
+    return normalize([rng.uniform(-1, 1) for _ in FEATURES])
+
+
+def seed_vector():
+    # The hand-tuned defaults, with no weight on wells
+    return normalize([DEFAULT_WEIGHTS.get(name, 0.0) for name in FEATURES])
+
+
+def play_candidate(vector, seeds, max_pieces):
+    # Runs in a worker: (vector, [(seed, score), ...])
+    results = play_chunk(seeds, PlacementAI(weights_dict(vector)), Board, max_pieces)
+    return vector, [(result['seed'], result['score']) for result in results]
+
+
+class GeneticTuner:
+    def __init__(self, population=50, games=20, base_seed=0, max_pieces=500,
+                 elite=5, tournament=5, mutation_rate=0.2, mutation_scale=0.2,
+                 seed=0, checkpoint=None, save_interval=60):
+        self.size = population
+        self.seeds = list(range(base_seed, base_seed + games))
+        self.max_pieces = max_pieces
+        self.elite = elite
+        self.tournament = tournament
+        self.mutation_rate = mutation_rate
+        self.mutation_scale = mutation_scale
+        self.checkpoint = checkpoint
+        self.save_interval = save_interval  # Seconds between checkpoints within a generation
+        self.rng = random.Random(seed)
+        self.generation = 0
+        self.cache = {}  # (vector, seed, max_pieces) -> score
+        self.population = [seed_vector()] + [random_vector(self.rng)
+                                             for _ in range(population - 1)]
+        self.history = []  # (generation, best fitness, mean fitness, best vector)
+
+    def key(self, vector, seed):
+        # Everything besides the weights that decides a game's score
+        return vector, seed, self.max_pieces
+
+    def settings(self):
+        return {'features': list(FEATURES), 'max_pieces': self.max_pieces}
+
+    def fitness(self, vector):
+        return sum(self.cache[self.key(vector, seed)] for seed in self.seeds) / len(self.seeds)
+
+    def evaluate(self, executor, chunk_size=5):
+        # Play every uncached (candidate, seed) game, chunk_size seeds per task
+        jobs = []
+        for vector in dict.fromkeys(self.population):
+            missing = [seed for seed in self.seeds if self.key(vector, seed) not in self.cache]
+            for i in range(0, len(missing), chunk_size):
+                jobs.append(executor.submit(play_candidate, vector, missing[i:i + chunk_size],
+                                            self.max_pieces))
+        saved = time.perf_counter()
+        for future in as_completed(jobs):
+            vector, scores = future.result()
+            for seed, score in scores:
+                self.cache[self.key(vector, seed)] = score
+            if time.perf_counter() - saved >= self.save_interval:
+                # Long generations: a resumed run only replays the missing games
+                self.save()
+                saved = time.perf_counter()
+        return len(jobs)
+
+    def select(self, ranked):
+        # Tournament: the fittest of a few random candidates
+        entrants = self.rng.sample(ranked, min(self.tournament, len(ranked)))
+        return max(entrants, key=lambda item: item[0])
+
+    def crossover(self, a, b):
+        # Fitness-weighted average of the two parents
+        (fa, va), (fb, vb) = a, b
+        total = fa + fb
+        share = 0.5 if total <= 0 else fa / total
+        return [share * x + (1 - share) * y for x, y in zip(va, vb)]
+
+    def mutate(self, vector):
+        return [w + self.rng.gauss(0, self.mutation_scale)
+                if self.rng.random() < self.mutation_rate else w for w in vector]
+
+    def breed(self, ranked):
+        # Keep the elite, fill the rest with children of tournament winners
+        children = [vector for _, vector in ranked[:self.elite]]
+        while len(children) < self.size:
+            child = self.crossover(self.select(ranked), self.select(ranked))
+            children.append(normalize(self.mutate(child)))
+        return children
+
+    def step(self, executor):
+        start = time.perf_counter()
+        jobs = self.evaluate(executor)
+        ranked = sorted(((self.fitness(v), v) for v in self.population), reverse=True)
+        best, best_vector = ranked[0]
+        mean = sum(f for f, _ in ranked) / len(ranked)
+        self.history.append((self.generation, best, mean, list(best_vector)))
+        self.population = self.breed(ranked)
+        self.generation += 1
+        self.save()
+        return {
+            'generation': self.generation - 1,
+            'best': best,
+            'mean': mean,
+            'weights': weights_dict(best_vector),
+            'tasks': jobs,
+            'duration': time.perf_counter() - start
+        }
+
+    def run(self, generations, workers=None, report=print):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while self.generation < generations:
+                result = self.step(executor)
+                report(f"generation {result['generation']}: best {result['best']:.1f} "
+                       f"mean {result['mean']:.1f} ({result['tasks']} tasks, "
+                       f"{result['duration']:.1f}s) {result['weights']}")
+
+    def best(self):
+        if not self.history:
+            return None
+        return weights_dict(tuple(self.history[-1][3]))
+
+    def state(self):
+        version, internal, gauss = self.rng.getstate()
+        population = set(self.population)
+        return {
+            'settings': self.settings(),
+            'generation': self.generation,
+            'population': [list(v) for v in self.population],
+            'seeds': self.seeds,
+            'history': self.history,
+            # Only the current population's games: those are the ones the
+            # next generation asks for again (the elite carries over)
+            'cache': [[list(v), seed, max_pieces, score]
+                      for (v, seed, max_pieces), score in self.cache.items()
+                      if v in population and max_pieces == self.max_pieces],
+            'rng': [version, list(internal), gauss]
+        }
+
+    def load_state(self, state):
+        # A different max_pieces only means the cached games are replayed;
+        # different features would change what the weight vectors mean
+        features = state['settings']['features']
+        if features != list(FEATURES):
+            raise ValueError(f"checkpoint tunes features {features}, not {list(FEATURES)}")
+        self.generation = state['generation']
+        self.population = [tuple(v) for v in state['population']]
+        self.seeds = state['seeds']
+        self.history = [tuple(entry) for entry in state['history']]
+        self.cache = {(tuple(v), seed, max_pieces): score
+                      for v, seed, max_pieces, score in state['cache']}
+        version, internal, gauss = state['rng']
+        self.rng.setstate((version, tuple(internal), gauss))
+
+    def save(self, path=None):
+        # Written to a temporary file first, so an interrupted write never
+        # leaves a truncated checkpoint behind
+        path = path or self.checkpoint
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp = path + '.tmp'
+        with open(temp, 'w') as f:
+            json.dump(self.state(), f)
+        os.replace(temp, path)
+
+    def load(self, path=None):
+        path = path or self.checkpoint
+        with open(path) as f:
+            self.load_state(json.load(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the AI evaluation weights with a genetic algorithm")
+    parser.add_argument('--generations', type=int, default=20)
+    parser.add_argument('--population', type=int, default=50)
+    parser.add_argument('--games', type=int, default=20, help="seeded games per candidate")
+    parser.add_argument('--max-pieces', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--checkpoint', default=os.path.join('tuner_results', 'checkpoint.json'))
+    parser.add_argument('--resume', action='store_true', help="continue from the checkpoint")
+    args = parser.parse_args()
+
+    tuner = GeneticTuner(population=args.population, games=args.games,
+                         max_pieces=args.max_pieces, seed=args.seed,
+                         checkpoint=args.checkpoint)
+    if args.resume and os.path.exists(args.checkpoint):
+        tuner.load()
+        print(f"resumed at generation {tuner.generation} ({len(tuner.cache)} cached games)")
+    tuner.run(args.generations, args.workers)
+    print(f"best weights: {tuner.best()}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,33 @@
+from collections import deque
+from constants import UNDO_LIMIT
+
+
+class UndoHistory:
+    # Bounded stack of board snapshots, one per spawned piece. Snapshots
+    # share unchanged rows, so a long history costs little more than the
+    # rows that actually changed.
+    def __init__(self, board, limit=UNDO_LIMIT):
+        self.board = board
+        self.snapshots = deque(maxlen=limit)
+        self.piece_index = None
+
+    def track(self):
+        # Call after anything that may have spawned a new piece
+        if self.board.stream_index != self.piece_index:
+            self.snapshots.append(self.board.snapshot())
+            self.piece_index = self.board.stream_index
+
+    def undo(self):
+        # Take back the last placement: return to the moment the previous
+        # piece spawned (or restart the current piece if there is none)
+        if len(self.snapshots) > 1:
+            self.snapshots.pop()
+        if not self.snapshots:
+            return False
+        self.board.restore(self.snapshots[-1])
+        self.piece_index = self.board.stream_index
+        return True
+
+    def clear(self):
+        self.snapshots.clear()
+        self.piece_index = None
\ No newline at end of file
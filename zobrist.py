@@ -0,0 +1,65 @@
+import random
+from collections import OrderedDict
+from constants import GRID_WIDTH, GRID_HEIGHT
+
+# One fixed 64-bit key per cell; a board's hash is the XOR of the keys of
+# its filled cells. The seed is fixed so hashes are stable across processes.
+_rng = random.Random(0x5EED7E7)
+CELL_KEYS = [[_rng.getrandbits(64) for _ in range(GRID_WIDTH)]
+             for _ in range(GRID_HEIGHT)]
+
+
+def row_hash(y, mask):
+    # Hash of row y given its occupancy bitmask (bit x = column x)
+    keys = CELL_KEYS[y]
+    h = 0
+    while mask:
+        low = mask & -mask
+        h ^= keys[low.bit_length() - 1]
+        mask ^= low
+    return h
+
+
+def grid_hash(masks):
+    h = 0
+    for y, mask in enumerate(masks):
+        if mask:
+            h ^= row_hash(y, mask)
+    return h
+
+
+class TranspositionTable:
+    # Bounded map from (board hash, piece, hold) to search results, evicting
+    # the least recently used entry once capacity is reached
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(board_hash, piece, hold=None):
+        return (board_hash, piece, hold)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, score, placement):
+        self.entries[key] = (score, placement)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
\ No newline at end of file